@@ -1,5 +1,6 @@
 import pygame
 import sys
+import time
 from src.config import *
 from src.scenes import TitleScene, OptionScene, GameScene, ResultScene
 from src.resources import Resources
@@ -19,19 +20,54 @@ def main():
 
     print("游戏启动成功！等待输入...")
 
+    full_redraw = True   # 切换场景后的第一帧整屏刷新
+
+    # 固定步长：update 每次推进 SIM_DT，按真实经过的时间（perf_counter）补足步数，
+    # 画面按剩下的零头在上一步和这一步之间插值 —— 帧率高低不影响游戏速度
+    accumulator = 0.0
+    last_time = time.perf_counter()
+
     running = True
     while running:
-        for event in pygame.event.get():
+        # 静态场景（标题 / 设置 / 结算）：阻塞等事件，几乎不占 CPU；超时当作一次定时 tick
+        idle = current_scene.idle and not full_redraw
+        if idle:
+            first = pygame.event.wait(IDLE_TICK_MS)
+            events = [] if first.type == pygame.NOEVENT else [first] + pygame.event.get()
+            before = current_scene.view_state()
+        else:
+            events = pygame.event.get()
+
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
             else:
                 current_scene.handle_event(event)
 
-        current_scene.update()
+        if idle:
+            # 醒来后重新计时，不去补空闲期间的模拟步
+            accumulator = 0.0
+            last_time = time.perf_counter()
+            current_scene.update()
+        else:
+            now = time.perf_counter()
+            accumulator += min(now - last_time, MAX_FRAME_TIME)
+            last_time = now
+
+            steps = 0
+            while accumulator >= SIM_DT and current_scene.next_scene == current_scene:
+                if steps == MAX_SIM_STEPS:
+                    accumulator = 0.0   # 追不上了：丢掉剩下的时间
+                    break
+                current_scene.update()
+                accumulator -= SIM_DT
+                steps += 1
 
         if current_scene.next_scene != current_scene:
             print(f"切换场景: {type(current_scene).__name__} -> {type(current_scene.next_scene).__name__}")
             current_scene = current_scene.next_scene
+            current_scene.invalidate()
+            full_redraw = True
 
             # ✅根据场景类型切换 BGM
             if isinstance(current_scene, (TitleScene, OptionScene)):
@@ -41,9 +77,24 @@ def main():
             elif isinstance(current_scene, ResultScene):
                 Resources.play_bgm("sum")
 
+        # 空闲场景里只是鼠标移动、外观没变：不用重画
+        if (idle and not full_redraw and events
+                and all(e.type == pygame.MOUSEMOTION for e in events)
+                and current_scene.view_state() == before):
+            continue
+
+        current_scene.interp = accumulator / SIM_DT
         current_scene.draw(screen)
-        pygame.display.flip()
-        clock.tick(FPS)
+
+        # DIRTY_RECTS 模式：只把变化的区域送到屏幕
+        rects = current_scene.get_dirty_rects() if DIRTY_RECTS and not full_redraw else None
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+        full_redraw = False
+        if not idle:
+            clock.tick(FPS)
 
     pygame.quit()
     sys.exit()
@@ -5,10 +5,26 @@ import os
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 FONT_PATH = "C:/Windows/Fonts/msgothic.ttc"  # Windows 默认日文字体
+# FONT_PATH 不存在时按顺序找（Linux / macOS 没有 msgothic）：先试文件路径，再按字体名问系统
+FONT_FALLBACKS = [
+    "C:/Windows/Fonts/meiryo.ttc",
+    "C:/Windows/Fonts/YuGothM.ttc",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/opentype/ipafont-gothic/ipagp.ttf",
+    "/System/Library/Fonts/ヒラギノ角ゴシック W3.ttc",
+    "notosanscjkjp", "notosanscjk", "ipagothic", "takaogothic", "vlgothic", "hiraginosans",
+]
 
 # --- 窗口参数 ---
 WIDTH, HEIGHT = 900, 600
-FPS = 60
+FPS = 60              # 渲染帧率上限（0 = 不限）；和游戏速度无关
+SIM_HZ = 60           # 模拟频率：每秒 update 几次（盘子速度等都按每步算）
+SIM_DT = 1.0 / SIM_HZ
+MAX_SIM_STEPS = 5     # 一帧最多补几步（机器太卡时宁可变慢，也不要越补越卡）
+MAX_FRAME_TIME = 0.25 # 一帧最多算多长时间（拖窗口 / 断点停住之后不要一下补几百步）
+IDLE_TICK_MS = 1000   # 空闲场景（标题 / 设置 / 结算）没有输入时多久重画一次
+DIRTY_RECTS = False   # True = 游戏画面只刷新变化的区域（低配机器用）；切换场景时仍整屏刷新
 
 # --- 颜色主题 (木纹风) ---
 # 这里的颜色可以在 Google 搜 "Wood Color Palette" 找更好看的
@@ -31,6 +47,22 @@ DEFAULT_SETTINGS = {
     "sound": True           # 是否开启音效
 }
 
+# --- 大词库流式读取 ---
+STREAM_THRESHOLD_BYTES = 2 * 1024 * 1024   # json 超过这个大小就改成流式读取（缩进格式约 130 字节/条 ≈ 1.5 万条）
+STREAM_READY_COUNT = 200                   # 读够多少条就可以开局
+STREAM_POOL_MAX = 20000                    # 最多保留多少条（超过后随机抽样）
+
+# 地域コース：地域名 -> 都道府県列表（None = 全国）
+REGIONS = {
+    "全国": None,
+    "北海道・東北": ["北海道", "青森県", "岩手県", "宮城県", "秋田県", "山形県", "福島県"],
+    "関東": ["茨城県", "栃木県", "群馬県", "埼玉県", "千葉県", "東京都", "神奈川県"],
+    "中部": ["新潟県", "富山県", "石川県", "福井県", "山梨県", "長野県", "岐阜県", "静岡県", "愛知県"],
+    "近畿": ["三重県", "滋賀県", "京都府", "大阪府", "兵庫県", "奈良県", "和歌山県"],
+    "中国・四国": ["鳥取県", "島根県", "岡山県", "広島県", "山口県", "徳島県", "香川県", "愛媛県", "高知県"],
+    "九州・沖縄": ["福岡県", "佐賀県", "長崎県", "熊本県", "大分県", "宮崎県", "鹿児島県", "沖縄県"],
+}
+
 COURSE_COSTS = {
     "EASY": 3000,
     "MEDIUM": 5000,
@@ -45,6 +77,17 @@ TIME_BONUS_EVERY = 10   # 每多少连击奖励一次
 TIME_BONUS_AMOUNT = 1   # 每次奖励多少秒
 TIME_BONUS_CAP = 10     # 整局最多加多少秒
 
+PLATE_PREFETCH = 1      # 提前造好几个盘子（CLEARED 时直接换上）
+POPUP_POOL_SIZE = 16    # 同时显示的浮动提示上限（满了就复用最旧的）
+
+# ===== 多盘子模式（MULTI）：传送带上同时有好几个盘子 =====
+GAME_MODES = ["NORMAL", "MULTI"]
+MULTI_PLATE_SIZE = (165, 112) # 多盘子模式的盘子尺寸（原图 220x150 缩小，两条轨道上下不重叠）
+MULTI_LANES_Y = [148, 263]    # 每条轨道上盘子的 y（间距 >= 盘子高度）
+MULTI_PLATE_MAX = 12          # 传送带上最多几个盘子（含刚出屏幕的）
+MULTI_PLATE_GAP = 240         # 同一条轨道上两个盘子的最小间距（px）；相邻轨道错开一半
+MULTI_PLATE_SPEED = 2.0       # 多盘子模式统一速度（同轨道不会追尾）
+
 # 按“目标最短罗马字长度”分档（你可以后面再调数值）
 # (上限, base分)
 PRICE_TIERS = [
@@ -53,3 +96,12 @@ PRICE_TIERS = [
     (11, 180),
     (999, 250),
 ]
+
+# 各コース的出词分布（见 scheduler.WordScheduler）
+# weights：每个价格档位的权重（None = 按档位词数，相当于整体随机）
+# ramp：combo 越高越偏向长词（0 = 不变）
+COURSE_SCHEDULES = {
+    "EASY":   {"weights": None, "ramp": 0.0},
+    "MEDIUM": {"weights": None, "ramp": 0.0},
+    "HARD":   {"weights": None, "ramp": 0.0},
+}
@@ -0,0 +1,272 @@
+import random
+import pygame
+
+from .config import *
+from .resources import TextCache, Fonts
+
+# ============================================================
+# 多盘子模式：传送带上同时有好几个盘子
+# - PlateSprite：盘子 + 名字 + 罗马字合成一张图（输入进度变了才重画）
+# - PlateRouter：所有盘子共用一个已输入前缀，按键查一次表就知道给谁
+# - Conveyor：轨道 / 出盘 / 回收，用 LayeredUpdates 按轨道分层画
+# ============================================================
+
+
+class PlateSprite(pygame.sprite.Sprite):
+    """一个盘子的精灵：image 在 plate.version 变化时重新合成"""
+    TAG_H = 44       # 名牌高度（盘子图下半部分）
+    TAG_ALPHA = 190
+
+    def __init__(self, plate, lane, show_roma=True, size=MULTI_PLATE_SIZE):
+        super().__init__()
+        self.plate = plate
+        self.lane = lane
+        self.show_roma = show_roma
+        self.size = size
+        self.font_name = Fonts.get(FONT_PATH, 20)
+        self.font_small = Fonts.get(FONT_PATH, 15)
+        self.font_roma = Fonts.get(None, 24)
+
+        # 缩小后的盘子图只做一次
+        if plate.image:
+            self.base = pygame.transform.smoothscale(plate.image, size)
+        else:
+            self.base = pygame.Surface(size, pygame.SRCALPHA)
+
+        self._version = None
+        self.image = None
+        self.rect = pygame.Rect(int(plate.x), int(plate.y), *size)
+        self.refresh()
+
+    def name_surf(self, max_w):
+        """名字放不下时依次去掉都道府県、换小字号"""
+        plate = self.plate
+        for font, text in ((self.font_name, plate.prefix_kanji + plate.kanji),
+                           (self.font_name, plate.kanji),
+                           (self.font_small, plate.kanji)):
+            surf = TextCache.render(font, text, BLACK)
+            if surf.get_width() <= max_w:
+                break
+        return surf
+
+    def refresh(self):
+        plate = self.plate
+        if self._version == plate.version:
+            return
+        self._version = plate.version
+
+        w, h = self.size
+        surf = self.base.copy()
+
+        # 名牌：都道府県 + 市町村，下面一行罗马字（红色已输入 + 灰色未输入）
+        tag = pygame.Surface((w, self.TAG_H), pygame.SRCALPHA)
+        tag.fill((255, 255, 255, self.TAG_ALPHA))
+        name = self.name_surf(w - 6)
+        tag.blit(name, ((w - name.get_width()) // 2, 2))
+        if self.show_roma:
+            typed, remaining = plate.get_display_text()
+            t_surf = TextCache.render(self.font_roma, typed, RED)
+            u_surf = TextCache.render(self.font_roma, remaining, (150, 150, 150))
+            x = (w - t_surf.get_width() - u_surf.get_width()) // 2
+            tag.blit(t_surf, (x, 24))
+            tag.blit(u_surf, (x + t_surf.get_width(), 24))
+        surf.blit(tag, (0, h - self.TAG_H))
+
+        self.image = surf
+
+    def update(self, alpha=1.0):
+        plate = self.plate
+        shake = plate.shake_amount
+        dx = random.randint(-shake, shake) if shake > 0 else 0
+        dy = random.randint(-shake, shake) if shake > 0 else 0
+        self.rect.topleft = (int(plate.render_x(alpha)) + dx, int(plate.y) + dy)
+        self.refresh()
+
+
+class PlateRouter:
+    """
+    多盘子输入分发
+    所有盘子共用一个“已输入前缀” typed：
+    - candidates = 和 typed 一致的盘子（各自停在自己自动机的对应状态上）
+    - index[ch] = candidates 里下一个键可以是 ch 的盘子（由各自动机的 next_keys 合成，缓存到下次按键）
+    每个按键只查一次 index，只有接得住这个键的盘子才会 check_input；
+    没接住的盘子退出候选并回到初始状态。有盘子 CLEARED 后所有盘子重新开始。
+    """
+    def __init__(self):
+        self.plates = []
+        self.candidates = []
+        self.typed = ""
+        self._index = None
+
+    def add(self, plate):
+        self.plates.append(plate)
+        # 已经输入了一半时新来的盘子不算候选（它不在这个前缀上）
+        if not self.typed:
+            self.candidates.append(plate)
+            self._index = None
+
+    def remove(self, plate):
+        if plate in self.plates:
+            self.plates.remove(plate)
+        if plate in self.candidates:
+            self.candidates.remove(plate)
+            self._index = None
+            if not self.candidates:
+                self.reset()
+
+    def reset(self):
+        """清空已输入前缀：所有盘子回到初始状态，全部重新成为候选"""
+        for p in self.plates:
+            p.reset()
+        self.candidates = list(self.plates)
+        self.typed = ""
+        self._index = None
+
+    def index(self):
+        if self._index is None:
+            index = {}
+            for p in self.candidates:
+                for ch in p.get_next_keys():
+                    index.setdefault(ch, []).append(p)
+            self._index = index
+        return self._index
+
+    def focus(self):
+        """HUD 上显示的盘子：候选里最靠左（最快流走）的那个"""
+        if not self.candidates:
+            return None
+        return min(self.candidates, key=lambda p: p.x)
+
+    def feed(self, ch):
+        """
+        输入一个字符，返回 (结果, 盘子列表)：
+        - ("IGNORE", [])：传送带上没有盘子
+        - ("MISS", candidates)：哪个候选都接不住（这些盘子要抖一下）
+        - ("HIT", 接住的盘子)
+        - ("CLEARED", 打完的盘子)：打完的盘子已经移出，其余盘子重新开始
+        """
+        if not self.candidates:
+            return "IGNORE", []
+
+        targets = self.index().get(ch)
+        if targets:
+            return self._advance(ch, targets)
+
+        missed = self.candidates
+        if self.typed and any(ch in p.automaton.next_keys[0] for p in self.plates):
+            # 前缀走不下去，但有盘子可以从这个键开始：照样算打错，
+            # 然后放弃前缀，让这个键从头喂给能接住它的盘子
+            # （哪个盘子都不能从这个键开始时保留前缀）
+            self.reset()
+            result, plates = self._advance(ch, self.index()[ch])
+            if result == "CLEARED":
+                return result, plates   # 一个键就能打完的词：没有前缀可丢，算打完
+        return "MISS", missed
+
+    def _advance(self, ch, targets):
+        """把 ch 喂给 targets（都接得住），其余候选回到初始状态"""
+        targets = list(targets)
+        for p in self.candidates:
+            if p not in targets:
+                p.reset()
+
+        cleared = [p for p in targets if p.check_input(ch) == "CLEARED"]
+        self.candidates = targets
+        self.typed += ch
+        self._index = None
+
+        if cleared:
+            for p in cleared:
+                self.plates.remove(p)
+            self.reset()
+            return "CLEARED", cleared
+        return "HIT", targets
+
+
+class Conveyor:
+    """
+    多盘子传送带：make_plate() 造新盘子（GameScene 的预取队列 + 出词器），
+    按轨道轮流出盘，同一轨道间距至少 MULTI_PLATE_GAP，
+    相邻两次出盘至少隔半个间距（各轨道错开，不会上下对齐）
+    """
+    def __init__(self, make_plate, show_roma=True,
+                 lanes_y=MULTI_LANES_Y, max_plates=MULTI_PLATE_MAX,
+                 gap=MULTI_PLATE_GAP, speed=MULTI_PLATE_SPEED):
+        self.make_plate = make_plate
+        self.show_roma = show_roma
+        self.lanes_y = lanes_y
+        self.max_plates = max_plates
+        self.gap = gap
+        self.speed = speed
+
+        self.group = pygame.sprite.LayeredUpdates()
+        self.router = PlateRouter()
+        self.sprites = {}                    # plate -> PlateSprite
+        self.lane_last = [None] * len(lanes_y)  # 每条轨道最后出的盘子
+        self.travel = gap                       # 上次出盘之后传送带走了多远（px）
+        self._next_lane = 0
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def spawn(self):
+        """有空位的轨道出一个盘子；返回是否出了盘"""
+        if len(self.sprites) >= self.max_plates:
+            return False
+        if self.travel < self.gap // 2:
+            return False
+        for k in range(len(self.lanes_y)):
+            lane = (self._next_lane + k) % len(self.lanes_y)
+            last = self.lane_last[lane]
+            if last is not None and last in self.sprites and last.x > WIDTH - self.gap:
+                continue
+
+            plate = self.make_plate()
+            plate.y = self.lanes_y[lane]
+            plate.speed = self.speed
+            sprite = PlateSprite(plate, lane, self.show_roma)
+            self.group.add(sprite, layer=lane)
+            self.sprites[plate] = sprite
+            self.router.add(plate)
+            self.lane_last[lane] = plate
+            self.travel = 0
+            self._next_lane = (lane + 1) % len(self.lanes_y)
+            return True
+        return False
+
+    def remove(self, plate):
+        sprite = self.sprites.pop(plate, None)
+        if sprite is not None:
+            sprite.kill()
+        self.router.remove(plate)
+
+    def update(self):
+        """移动所有盘子，返回流走的盘子列表；有空位就补盘"""
+        self.travel += self.speed
+        # 整个盘子出了屏幕左边就算流走（看不见的盘子不能再打，也不能留在 HUD 上）
+        lost = [p for p, sprite in list(self.sprites.items())
+                if p.update() or p.x + sprite.size[0] <= 0]
+        for p in lost:
+            self.remove(p)
+        self.spawn()
+        return lost
+
+    def feed(self, ch):
+        result, plates = self.router.feed(ch)
+        if result == "CLEARED":
+            for p in plates:
+                sprite = self.sprites.pop(p, None)
+                if sprite is not None:
+                    sprite.kill()
+        elif result == "MISS":
+            for p in plates:
+                p.shake_amount = 10
+        return result, plates
+
+    def focus(self):
+        return self.router.focus()
+
+    def draw(self, screen, alpha=1.0):
+        """画所有盘子（位置按 alpha 插值），返回画到的区域"""
+        self.group.update(alpha)
+        return self.group.draw(screen)
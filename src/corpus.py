@@ -0,0 +1,542 @@
+import hashlib
+import json
+import mmap
+import os
+import random
+import re
+import struct
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+
+from .config import (DATA_DIR, PRICE_TIERS, STREAM_THRESHOLD_BYTES,
+                     STREAM_READY_COUNT, STREAM_POOL_MAX)
+
+# ============================================================
+# 二进制词库（words_*.bin）
+# ============================================================
+# 由 tools/compile_corpus.py 从 words_*.json 生成，游戏里用 mmap 打开，按需解码。
+#
+# 文件布局（小端）：
+#   [header][entry 记录 × N][字符串索引 × M][假名拆分长度][字符串数据(UTF-8)]
+#   header 里带 ROMA_MAP 的哈希：ROMA_MAP 改了之后 min_len / 档位就不对了，要重新编译
+#   entry：prefix/kanji/kana/roma 的字符串 id、拆分起点、拆分个数、最短按键数
+#   （价格档位不存：PRICE_TIERS 会调，由 scheduler 按最短按键数现算）
+#   字符串全部去重（intern），同一个都道府县名只存一份
+
+MAGIC = b"SSDC"
+VERSION = 3
+
+HEADER = struct.Struct("<4sHH8sIIIII") # magic, version, 保留, ROMA_MAP 哈希, 词数, 字符串数, 索引/拆分/数据 起点
+ENTRY = struct.Struct("<IIIIIHH")      # prefix, kanji, kana, roma, split_off, split_count, min_len
+STR_INDEX = struct.Struct("<II")       # 数据内偏移, 字节长度
+
+NO_STRING = 0xFFFFFFFF
+
+
+def roma_map_hash():
+    """ROMA_MAP 的 sha1（十六进制）：词库里预先算好的东西都依赖它"""
+    from .models import ROMA_MAP
+    data = json.dumps(ROMA_MAP, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(data).hexdigest()
+
+
+def roma_map_digest():
+    """写进 .bin header 的 8 字节版本"""
+    return bytes.fromhex(roma_map_hash())[:8]
+
+
+def price_tier(L):
+    """最短按键数 -> PRICE_TIERS 的下标"""
+    for i, (upper, _) in enumerate(PRICE_TIERS):
+        if L <= upper:
+            return i
+    return len(PRICE_TIERS) - 1
+
+
+def write_binary_corpus(words, path):
+    """把词列表（json 里的 dict）写成二进制词库"""
+    from .models import compile_word
+
+    string_ids = {}
+    index = bytearray()
+    blob = bytearray()
+
+    def intern(text):
+        if text is None:
+            return NO_STRING
+        sid = string_ids.get(text)
+        if sid is None:
+            data = text.encode("utf-8")
+            sid = len(string_ids)
+            string_ids[text] = sid
+            index.extend(STR_INDEX.pack(len(blob), len(data)))
+            blob.extend(data)
+        return sid
+
+    records = bytearray()
+    splits = bytearray()
+    for word in words:
+        kana = word["kana"]
+        automaton = compile_word(kana)
+        min_len = automaton.min_len or 0   # 0 = 打不完（ROMA_MAP 缺假名）
+
+        split_off = len(splits)
+        splits.extend(len(k) for k in automaton.kana_list)
+
+        records.extend(ENTRY.pack(
+            intern(word.get("prefix_kanji")),
+            intern(word["kanji"]),
+            intern(kana),
+            intern(word.get("roma", "")),
+            split_off,
+            len(automaton.kana_list),
+            min_len,
+        ))
+
+    index_off = HEADER.size + len(records)
+    split_off = index_off + len(index)
+    blob_off = split_off + len(splits)
+    header = HEADER.pack(MAGIC, VERSION, 0, roma_map_digest(), len(words), len(string_ids),
+                         index_off, split_off, blob_off)
+
+    # 先写临时文件再替换，避免游戏读到写了一半的文件
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(records)
+        f.write(index)
+        f.write(splits)
+        f.write(blob)
+    os.replace(tmp_path, path)
+
+
+class BinaryCorpus:
+    """
+    mmap 打开的二进制词库：打开时只读 header，词条在取用时才解码
+    支持 len() / 下标访问，可以直接交给 random.choice
+    """
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            (magic, version, _, digest, self._count, self._string_count,
+             self._index_off, self._split_off, self._blob_off) = HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"不支持的词库格式: {magic!r} v{version}")
+            if digest != roma_map_digest():
+                raise ValueError("ROMA_MAP 已经改过，请重新运行 tools/compile_corpus.py")
+        except Exception:
+            self.close()
+            raise
+
+        self._strings = {}   # 字符串 id -> str（懒解码缓存）
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("BinaryCorpus index out of range")
+
+        prefix, kanji, kana, roma, split_off, split_count, min_len = \
+            ENTRY.unpack_from(self._mm, HEADER.size + i * ENTRY.size)
+
+        kana = self._string(kana)
+        kana_list = []
+        pos = 0
+        start = self._split_off + split_off
+        for n in self._mm[start:start + split_count]:
+            kana_list.append(kana[pos:pos + n])
+            pos += n
+
+        word = {
+            "kanji": self._string(kanji),
+            "kana": kana,
+            "roma": self._string(roma),
+            "kana_list": kana_list,
+            "min_len": min_len,
+        }
+        if prefix != NO_STRING:
+            word["prefix_kanji"] = self._string(prefix)
+        return word
+
+    def min_len_of(self, i):
+        """只读第 i 个词的最短按键数（不解码字符串，建索引用）"""
+        return ENTRY.unpack_from(self._mm, HEADER.size + i * ENTRY.size)[6]
+
+    def prefecture_of(self, i):
+        """只读第 i 个词的都道府县（建索引用）"""
+        prefix, kanji = ENTRY.unpack_from(self._mm, HEADER.size + i * ENTRY.size)[:2]
+        return self._string(prefix if prefix != NO_STRING else kanji)
+
+    def _string(self, sid):
+        text = self._strings.get(sid)
+        if text is None:
+            off, length = STR_INDEX.unpack_from(self._mm, self._index_off + sid * STR_INDEX.size)
+            start = self._blob_off + off
+            text = self._mm[start:start + length].decode("utf-8")
+            self._strings[sid] = text
+        return text
+
+    def close(self):
+        mm = getattr(self, "_mm", None)
+        if mm is not None:
+            mm.close()
+            self._mm = None
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+def word_file_paths(difficulty):
+    """(json 路径, bin 路径, jsonl 路径)"""
+    base = os.path.join(DATA_DIR, f"words_{difficulty.lower()}")
+    return base + ".json", base + ".bin", base + ".jsonl"
+
+
+def load_word_list(difficulty):
+    """
+    读取某个难度的词库：
+    - 有比 json 新的 .bin 时用 mmap 打开（几乎不花时间）
+    - json 很大（超过 STREAM_THRESHOLD_BYTES）或只有 .jsonl 时流式读取，读够一部分就开局
+    - 否则照旧 json.load
+    """
+    json_path, bin_path, jsonl_path = word_file_paths(difficulty)
+
+    if os.path.exists(bin_path):
+        if not os.path.exists(json_path) or os.path.getmtime(bin_path) >= os.path.getmtime(json_path):
+            try:
+                return BinaryCorpus(bin_path)
+            except (OSError, ValueError) as e:
+                print(f"提示: 二进制词库不可用 {bin_path}: {e}")
+        else:
+            print(f"提示: {bin_path} 比 json 旧，改用 json（请重新运行 tools/compile_corpus.py）")
+
+    if not os.path.exists(json_path) and os.path.exists(jsonl_path):
+        return StreamingWordPool.open(jsonl_path)
+
+    if os.path.getsize(json_path) > STREAM_THRESHOLD_BYTES:
+        return StreamingWordPool.open(json_path)
+
+    with open(json_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ============================================================
+# 流式读取（自定义大词库：几万条以上）
+# ============================================================
+
+_SKIP = re.compile(r"[\s,]*")   # 数组元素之间的空白和逗号
+
+
+def _iter_json_array(f, chunk_size):
+    """分块解析 JSON 数组，一次 yield 一个元素；缓冲区只保留未解析的部分"""
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+    opened = False
+
+    while True:
+        pos = _SKIP.match(buf, pos).end()
+        if pos >= len(buf):
+            if eof:
+                raise ValueError("JSON 数组没有正常结束")
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+
+        if not opened:
+            if buf[pos] != "[":
+                raise ValueError("词库不是 JSON 数组")
+            opened = True
+            pos += 1
+            continue
+
+        if buf[pos] == "]":
+            return
+
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # 元素被块边界截断：再读一块
+            if eof:
+                raise
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+
+        yield obj
+        pos = end
+        if pos > chunk_size:
+            buf, pos = buf[pos:], 0
+
+
+def iter_word_file(path, chunk_size=64 * 1024):
+    """逐条读取词条：.jsonl 每行一条；.json 按数组分块解析"""
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        else:
+            yield from _iter_json_array(f, chunk_size)
+
+
+def clean_word(raw):
+    """
+    校验并精简一条词：只保留游戏用到的字段，字符串 intern（都道府県名大量重复）
+    不合格（字段缺失 / 有 ROMA_MAP 里没有的假名）返回 None
+    """
+    from .models import ROMA_MAP, split_kana
+
+    if not isinstance(raw, dict):
+        return None
+    kanji = raw.get("kanji")
+    kana = raw.get("kana")
+    if not isinstance(kanji, str) or not isinstance(kana, str) or not kanji or not kana:
+        return None
+    if any(k not in ROMA_MAP for k in split_kana(kana)):
+        return None
+
+    word = {"kanji": sys.intern(kanji), "kana": sys.intern(kana)}
+    roma = raw.get("roma")
+    if isinstance(roma, str):
+        word["roma"] = roma
+    prefix = raw.get("prefix_kanji")
+    if isinstance(prefix, str) and prefix:
+        word["prefix_kanji"] = sys.intern(prefix)
+    return word
+
+
+class EmptySelectionError(ValueError):
+    """选中的都道府県在词库里一个词也没有"""
+
+
+class StreamingWordPool:
+    """
+    后台线程流式读取的词库：
+    - 读够 ready_count 条就可以开局，其余继续在后台填充（len() 会慢慢变大）
+    - 最多保留 max_words 条：超过后做蓄水池抽样（整个文件等概率），内存不随文件大小增长
+    - keep：只收这些都道府県的词（地域コース；None = 全部）
+    支持 len() / 下标访问；列表只会 append 或原地替换，游戏线程直接读即可
+    """
+    def __init__(self, path, ready_count=STREAM_READY_COUNT, max_words=STREAM_POOL_MAX,
+                 chunk_size=64 * 1024, keep=None):
+        self.path = path
+        self.keep = keep
+        self.words = []
+        self.ready_count = ready_count
+        self.max_words = max_words
+        self.chunk_size = chunk_size
+        self.seen = 0       # 读到的合格词数
+        self.skipped = 0    # 不合格被跳过的条数
+        self.done = False
+        self.error = None
+        self._ready = threading.Event()
+        self._rng = random.Random()
+        self._thread = threading.Thread(target=self._fill, name="word-loader", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def open(cls, path, timeout=5.0, keep=None):
+        """
+        开始读取并等到可以开局（读够 ready_count 条或读完）
+        等不到任何可用的词（超时 / 读取出错 / 全部不合格）时抛异常，由调用方退回别的词库
+        """
+        pool = cls(path, keep=keep)
+        pool.wait_ready(timeout)
+        if not pool.words:
+            if pool.error:
+                raise pool.error
+            if not pool.done:
+                raise TimeoutError(f"{timeout}s 内没有读到可用的词: {path}")
+            if keep is not None:
+                raise EmptySelectionError(f"词库里没有 {'/'.join(sorted(keep))} 的词: {path}")
+            raise ValueError(f"词库里没有可用的词（跳过 {pool.skipped} 条）: {path}")
+        return pool
+
+    def _fill(self):
+        try:
+            for raw in iter_word_file(self.path, self.chunk_size):
+                word = clean_word(raw)
+                if word is None:
+                    self.skipped += 1
+                    continue
+                if self.keep is not None and prefecture_of(word) not in self.keep:
+                    continue
+
+                self.seen += 1
+                if len(self.words) < self.max_words:
+                    self.words.append(word)
+                else:
+                    # 蓄水池抽样
+                    j = self._rng.randrange(self.seen)
+                    if j < self.max_words:
+                        self.words[j] = word
+
+                if self.seen == self.ready_count:
+                    self._ready.set()
+        except Exception as e:
+            self.error = e
+            print(f"提示: 词库读取中断 {self.path}: {e}")
+        finally:
+            self.done = True
+            self._ready.set()
+
+    def wait_ready(self, timeout=None):
+        return self._ready.wait(timeout)
+
+    def __len__(self):
+        return len(self.words)
+
+    def __getitem__(self, i):
+        return self.words[i]
+
+
+# ============================================================
+# 都道府県索引 / 子集视图
+# ============================================================
+
+def prefecture_of(word):
+    """词所属的都道府県（EASY 词库本身就是都道府県名，没有 prefix_kanji）"""
+    return word.get("prefix_kanji") or word.get("kanji", "")
+
+
+def build_prefecture_index(pool):
+    """都道府県 -> 词下标 array（加载词库时建一次）"""
+    fast = getattr(pool, "prefecture_of", None)
+    index = {}
+    for i in range(len(pool)):
+        pref = fast(i) if fast else prefecture_of(pool[i])
+        offsets = index.get(pref)
+        if offsets is None:
+            offsets = index[pref] = array("I")
+        offsets.append(i)
+    return index
+
+
+class PoolView:
+    """
+    词库的子集：只保存下标，不复制词条
+    和 list / BinaryCorpus 一样支持 len() / 下标访问
+    """
+    def __init__(self, pool, offsets):
+        self.pool = pool
+        self.offsets = offsets
+        if hasattr(pool, "min_len_of"):
+            self.min_len_of = lambda i: pool.min_len_of(offsets[i])
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, i):
+        return self.pool[self.offsets[i]]
+
+
+# ============================================================
+# 进程内词库缓存（重开 / 换难度都不再读盘）
+# ============================================================
+
+class WordPoolCache:
+    """
+    difficulty -> 词库，按文件 mtime 判断是否过期，
+    所有缓存词库的总词数超过 max_words 时按 LRU 淘汰（当前这个不淘汰）
+    """
+    max_words = 20000
+    _pools = OrderedDict()   # difficulty -> {"stamp", "pool", "prefectures", "views"}
+
+    @classmethod
+    def select(cls, difficulty, prefectures=None):
+        """
+        只包含指定都道府県（任意组合）的词库视图；不指定就是整个词库
+        只拼接下标 array，不扫描 / 复制词条；同一组合会复用同一个视图
+        一个词也没有时抛 EmptySelectionError（由设置画面提示玩家）
+        """
+        entry = cls._entry(difficulty)
+        if not prefectures:
+            return entry["pool"]
+
+        key = tuple(sorted(set(prefectures)))
+        view = entry["views"].get(key)
+        if view is not None:
+            return view
+
+        pool = entry["pool"]
+        if entry["prefectures"] is None:
+            if not pool.done:
+                # 流式词库还在读、没有索引：另开一个只收这些都道府県的流式读取
+                view = entry["views"][key] = StreamingWordPool.open(pool.path, keep=set(key))
+                return view
+            entry["prefectures"] = build_prefecture_index(pool)
+
+        offsets = array("I")
+        for pref in key:
+            offsets.extend(entry["prefectures"].get(pref, ()))
+        if not offsets:
+            raise EmptySelectionError(f"{difficulty} 词库里没有 {'/'.join(key)} 的词")
+        view = entry["views"][key] = PoolView(pool, offsets)
+        return view
+
+    @classmethod
+    def _entry(cls, difficulty):
+        key = difficulty.upper()
+        stamp = cls._stamp(key)
+
+        cached = cls._pools.get(key)
+        if cached and cached["stamp"] == stamp:
+            cls._pools.move_to_end(key)
+            return cached
+
+        pool = load_word_list(key)
+        entry = {
+            "stamp": stamp,
+            "pool": pool,
+            "prefectures": None if isinstance(pool, StreamingWordPool) else build_prefecture_index(pool),
+            "views": {},
+        }
+        if cached:
+            cls._drop(cached)   # 文件改过了：旧词库不再用
+        cls._pools[key] = entry
+        cls._pools.move_to_end(key)
+        cls._evict()
+        return entry
+
+    @classmethod
+    def clear(cls):
+        for entry in cls._pools.values():
+            cls._drop(entry)
+        cls._pools.clear()
+
+    @staticmethod
+    def _drop(entry):
+        """词库移出缓存时释放它占的资源（BinaryCorpus 的 mmap / 文件句柄）"""
+        close = getattr(entry["pool"], "close", None)
+        if close is not None:
+            close()
+
+    @classmethod
+    def _stamp(cls, difficulty):
+        stamp = []
+        for path in word_file_paths(difficulty):
+            try:
+                stamp.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    @classmethod
+    def _evict(cls):
+        total = sum(len(entry["pool"]) for entry in cls._pools.values())
+        while total > cls.max_words and len(cls._pools) > 1:
+            _, entry = cls._pools.popitem(last=False)
+            total -= len(entry["pool"])
+            cls._drop(entry)
@@ -1,6 +1,6 @@
 import pygame
 from .config import *
-from .resources import Resources
+from .resources import Resources, TextCache, Fonts
 
 
 
@@ -8,6 +8,22 @@ class UIElement:
     """所有 UI 组件的基类"""
     def __init__(self, x, y, w, h):
         self.rect = pygame.Rect(x, y, w, h)
+        self._faces = {}   # 预先画好的外观：key -> Surface
+
+    def get_face(self, key, build):
+        """
+        外观缓存：key 包含所有影响外观的东西（文字 / 尺寸 / 状态），
+        key 没见过才调用 build() 重画，平时 draw 只需要一次 blit
+        """
+        face = self._faces.get(key)
+        if face is None:
+            if len(self._faces) >= 16:   # 文字一直在变的情况：别无限增长
+                self._faces.clear()
+            face = build()
+            if pygame.display.get_surface() is not None:
+                face = face.convert_alpha()
+            self._faces[key] = face
+        return face
 
     def update(self):
         pass
@@ -18,6 +34,10 @@ class UIElement:
     def handle_event(self, event):
         pass
 
+    def view_state(self):
+        """外观相关状态的快照（空闲场景用：没变就不用重画）"""
+        return None
+
 
 class TextLabel(UIElement):
     """纯文本标签，用于显示标题或说明"""
@@ -25,7 +45,7 @@ class TextLabel(UIElement):
         super().__init__(x, y, 0, 0)
         self.text = text
         self.color = color
-        self.font = pygame.font.Font(FONT_PATH, font_size)
+        self.font = Fonts.get(FONT_PATH, font_size)
         self.center = center
         self._render()
 
@@ -48,44 +68,64 @@ class Button(UIElement):
         self.text = text
         self.callback = callback  # 点击后执行的函数
         self.click_sound = click_sound
-        self.font = pygame.font.Font(FONT_PATH, font_size)
+        self.font = Fonts.get(FONT_PATH, font_size)
         self.is_hovered = False
+        self.is_pressed = False   # 左键按下、还没松开
         
     def update(self):
         # 检测鼠标悬停
         mouse_pos = pygame.mouse.get_pos()
         self.is_hovered = self.rect.collidepoint(mouse_pos)
 
+    def get_state(self):
+        if self.is_hovered and self.is_pressed:
+            return "pressed"
+        return "hover" if self.is_hovered else "normal"
+
+    def view_state(self):
+        return (self.text, self.get_state())
+
+    def build_face(self, state):
+        # 1. 创建一个支持透明度的表面 (Surface)
+        s = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
+
+        # 2. 设置颜色和透明度 (RGBA)
+        # 悬停时金黄色半透明，按下时再深一点，平时深木色半透明
+        if state == "pressed":
+            bg_color = (170, 140, 44, 235)
+            text_color = BLACK
+        elif state == "hover":
+            bg_color = (212, 175, 55, 220)  # GOLD + Alpha(220)
+            text_color = BLACK
+        else:
+            bg_color = (61, 43, 31, 180)    # WOOD_DARK + Alpha(180)
+            text_color = WHITE
+
+        # 3. 圆角矩形
+        pygame.draw.rect(s, bg_color, s.get_rect(), border_radius=12)
+        pygame.draw.rect(s, (255, 255, 255, 255), s.get_rect(), 2, border_radius=12) # 亮白边框
+
+        # 4. 文字（按下时往下沉 1 像素）
+        text_surf = self.font.render(self.text, True, text_color)
+        dy = 1 if state == "pressed" else 0
+        s.blit(text_surf, text_surf.get_rect(center=(s.get_width() // 2, s.get_height() // 2 + dy)))
+        return s
+
     def draw(self, screen):
-            # 1. 创建一个支持透明度的表面 (Surface)
-            s = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-            
-            # 2. 设置颜色和透明度 (RGBA)
-            # 悬停时金黄色半透明，平时深木色半透明
-            if self.is_hovered:
-                bg_color = (212, 175, 55, 220)  # GOLD + Alpha(220)
-                text_color = BLACK
-            else:
-                bg_color = (61, 43, 31, 180)    # WOOD_DARK + Alpha(180)
-                text_color = WHITE
-    
-            # 3. 在表面上画圆角矩形并贴到主屏幕
-            pygame.draw.rect(s, bg_color, s.get_rect(), border_radius=12)
-            pygame.draw.rect(s, (255, 255, 255, 255), s.get_rect(), 2, border_radius=12) # 亮白边框
-            screen.blit(s, self.rect.topleft)
-    
-            # 4. 绘制文字
-            text_surf = self.font.render(self.text, True, text_color)
-            text_rect = text_surf.get_rect(center=self.rect.center)
-            screen.blit(text_surf, text_rect)
+        state = self.get_state()
+        face = self.get_face((self.text, self.rect.size, state), lambda: self.build_face(state))
+        screen.blit(face, self.rect.topleft)
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             if self.rect.collidepoint(event.pos):
+                self.is_pressed = True
                 if self.click_sound:
                     Resources.play_se(self.click_sound)
                 if self.callback:
                     self.callback()
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            self.is_pressed = False
 
 class OptionBox(UIElement):
     """设置选项框：点击循环切换选项"""
@@ -100,8 +140,9 @@ class OptionBox(UIElement):
         self.options = options # 例如 ["EASY", "MEDIUM", "HARD"]
         self.index = default_index
         self.label = label # 选项左边的说明文字，例如 "难度:"
-        self.font = pygame.font.Font(FONT_PATH, 28)
+        self.font = Fonts.get(FONT_PATH, 28)
         self.is_hovered = False
+        self.is_pressed = False   # 左键按下、还没松开
         self.label_color = label_color
 
     def get_value(self):
@@ -112,35 +153,70 @@ class OptionBox(UIElement):
         mouse_pos = pygame.mouse.get_pos()
         self.is_hovered = self.rect.collidepoint(mouse_pos)
 
-    def draw(self, screen):
-        # 1. 绘制左侧说明文字
-        if self.label:
-            label_surf = self.font.render(self.label, True, self.label_color)
-            # 文字画在按钮左侧 10 像素处
-            screen.blit(label_surf, (self.rect.x - label_surf.get_width() - 15, self.rect.y + 10))
+    def get_state(self):
+        if self.is_hovered and self.is_pressed:
+            return "pressed"
+        return "hover" if self.is_hovered else "normal"
+
+    def view_state(self):
+        return (self.index, self.get_state())
+
+    def label_offset(self):
+        """说明文字占的宽度（外观 Surface 从 rect.x - label_offset() 开始）"""
+        if not self.label:
+            return 0
+        return TextCache.render(self.font, self.label, self.label_color).get_width() + 15
+
+    def build_face(self, current_text, state):
+        """说明文字 + 选项框画在同一张 Surface 上"""
+        off = self.label_offset()
+        w, h = self.rect.size
+        label_surf = TextCache.render(self.font, self.label, self.label_color) if self.label else None
+        face_h = max(h, 10 + label_surf.get_height()) if label_surf else h
+        s = pygame.Surface((off + w, face_h), pygame.SRCALPHA)
+
+        # 1. 左侧说明文字（画在按钮左侧 15 像素处）
+        if label_surf:
+            s.blit(label_surf, (0, 10))
+
+        # 2. 选项框背景
+        box = pygame.Rect(off, 0, w, h)
+        if state == "pressed":
+            bg_color = (170, 140, 44)
+        elif state == "hover":
+            bg_color = GOLD
+        else:
+            bg_color = WOOD_LIGHT
+        pygame.draw.rect(s, bg_color, box, border_radius=5)
+        pygame.draw.rect(s, WHITE, box, 2, border_radius=5)
 
-        # 2. 绘制选项框背景
-        bg_color = GOLD if self.is_hovered else WOOD_LIGHT
-        pygame.draw.rect(screen, bg_color, self.rect, border_radius=5)
-        pygame.draw.rect(screen, WHITE, self.rect, 2, border_radius=5)
+        # 3. 当前选项文字
+        text_color = BLACK if state != "normal" else WHITE
+        text_surf = self.font.render(current_text, True, text_color)
+        s.blit(text_surf, text_surf.get_rect(center=box.center))
+        return s
 
-        # 3. 绘制当前选项文字
+    def draw(self, screen):
         current_text = str(self.options[self.index])
         # 针对布尔值做一点显示优化
         if current_text == "True": current_text = "ON"
         if current_text == "False": current_text = "OFF"
-        
-        text_color = BLACK if self.is_hovered else WHITE
-        text_surf = self.font.render(current_text, True, text_color)
-        text_rect = text_surf.get_rect(center=self.rect.center)
-        screen.blit(text_surf, text_rect)
+
+        state = self.get_state()
+        key = (self.label, self.label_color, current_text, self.rect.size, state)
+        face = self.get_face(key, lambda: self.build_face(current_text, state))
+        # 选项框在 Surface 的最右边，左边多出来的是说明文字
+        screen.blit(face, (self.rect.right - face.get_width(), self.rect.y))
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 1 and self.is_hovered:
+                self.is_pressed = True
                 Resources.play_se("button")
                 # 循环切换下一个选项
                 self.index = (self.index + 1) % len(self.options)
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            self.is_pressed = False
 
 class Slider(UIElement):
     """简单滑条：值范围 0.0 ~ 1.0"""
@@ -148,7 +224,7 @@ class Slider(UIElement):
         super().__init__(x, y, w, h)
         self.label = label
         self.value = max(0.0, min(1.0, float(default_value)))
-        self.font = pygame.font.Font(FONT_PATH, 24)
+        self.font = Fonts.get(FONT_PATH, 24)
         self.dragging = False
         self.label_color = label_color
 
@@ -159,6 +235,9 @@ class Slider(UIElement):
     def get_value(self):
         return self.value
 
+    def view_state(self):
+        return (self.value, self.dragging)
+
     def _value_from_mouse(self, mx):
         left = self.rect.x
         right = self.rect.x + self.rect.w
@@ -186,7 +265,7 @@ class Slider(UIElement):
     def draw(self, screen):
         # label
         if self.label:
-            label_surf = self.font.render(self.label, True, self.label_color)
+            label_surf = TextCache.render(self.font, self.label, self.label_color)
             screen.blit(label_surf, (self.rect.x - label_surf.get_width() - 15, self.rect.y + 6))
 
         # track
@@ -203,5 +282,5 @@ class Slider(UIElement):
 
         # value text
         vtxt = f"{int(self.value * 100)}%"
-        v_surf = self.font.render(vtxt, True, WHITE)
+        v_surf = TextCache.render(self.font, vtxt, WHITE)
         screen.blit(v_surf, (self.rect.x + self.rect.w + 10, self.rect.y + 6))
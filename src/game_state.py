@@ -1,3 +1,5 @@
+from .config import REGIONS
+
 TIME_LIMITS = {
     "EASY": 60,
     "MEDIUM": 90,
@@ -15,14 +17,23 @@ class GameSettings:
         self.furigana = True
         self.se_volume = 0.8
         self.bgm_volume = 0.6
+        self.region = "全国"
+        self.mode = "NORMAL"      # NORMAL = 一次一个盘子；MULTI = 传送带上同时好几个
+        self.prefectures = None   # 直接指定都道府県（任意组合），优先于 region
 
     def apply_difficulty(self, diff: str):
         self.difficulty = diff
         self.time_limit = TIME_LIMITS.get(diff, 60)
 
+    def get_prefectures(self):
+        """出题范围：都道府県列表，None = 全国"""
+        if self.prefectures:
+            return self.prefectures
+        return REGIONS.get(self.region)
+
     def __repr__(self):
         return (
-            f"配置(难度={self.difficulty}, 时间={self.time_limit}s, "
+            f"配置(难度={self.difficulty}, 模式={self.mode}, 地域={self.region}, 时间={self.time_limit}s, "
             f"ローマ字={'ON' if self.show_roma else 'OFF'}, "
             f"ふりがな={'ON' if self.furigana else 'OFF'})"
         )
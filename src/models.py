@@ -1,6 +1,9 @@
 import pygame
 import random
-from .config import WIDTH
+import sys
+import heapq
+from collections import OrderedDict
+from .config import WIDTH, GOLD, POPUP_POOL_SIZE
 
 # ============================================================
 # 1) かな → ローマ字 对应表（支持多种合法输入）
@@ -78,18 +81,287 @@ def split_kana(text):
 # 3) 多路径输入状态（状态机路径）
 # ============================================================
 
-class InputPath:
-    def __init__(self, kana_index=0, buffer="", typed=""):
-        self.kana_index = kana_index
-        self.buffer = buffer
-        self.typed = typed
+# 一条路径 = (kana_index, buffer) 元组（buffer 字符串经过 intern，可共享）
+#   kana_index：正在输入第几个 kana
+#   buffer：当前 kana 已输入的部分
+# 玩家已输入的完整 romaji 对所有路径都一样，由盘子统一保存（typed_roma），不放进路径
 
-    def clone(self):
-        return InputPath(self.kana_index, self.buffer, self.typed)
+
+# ============================================================
+# 4) 合法拼法：上下文规则（促音 / 拨音）
+# ============================================================
+
+def _valid_romas(kana_list, kana_index):
+    """
+    获取 kana_list[kana_index] 的合法 romaji 列表（含上下文规则）
+    """
+    kana = kana_list[kana_index]
+    valid = list(ROMA_MAP.get(kana, []))
+
+
+    # -------- 促音：っ 的双写规则（补齐 ch/sh/ts 等）--------
+    if kana == 'っ' and kana_index + 1 < len(kana_list):
+        next_kana = kana_list[kana_index + 1]
+        next_romas = ROMA_MAP.get(next_kana, [])
+
+        # 1) 常规：允许双写“下一个拼法的首字母”（但只限辅音）
+        for r in next_romas:
+            if not r:
+                continue
+            fc = r[0]
+            if fc.isalpha() and fc not in "aeiou":
+                valid.append(fc)
+
+        # 2) 特殊：当下一假名以 ch/sh/ts 开头时，额外允许 t/s
+        # 目的是支持：っち -> tchi，っちゃ -> tcha 等
+        starts = set()
+        for r in next_romas:
+            if len(r) >= 2:
+                starts.add(r[:2])
+
+        # ch: 允许 t（tchi/tcha/tchu/tcho）
+        if "ch" in starts:
+            valid.append("t")
+
+        # sh: 有些规则表也允许 s（通常已包含，但保险）
+        if "sh" in starts:
+            valid.append("s")
+
+        # ts: 通常首字母就是 t，但保险
+        if "ts" in starts:
+            valid.append("t")
+
+
+    # -------- 拨音：ん 的 n 规则（图里那套）--------
+    if kana == 'ん':
+        if kana_index + 1 < len(kana_list):
+            next_kana = kana_list[kana_index + 1]
+            next_romas = ROMA_MAP.get(next_kana, [])
+            next_firsts = [r[0] for r in next_romas if r]
+
+            # 后面不是元音/y 开头，则允许单独 n
+            if next_firsts and all(c not in "aeiouy" for c in next_firsts):
+                if "n" not in valid:
+                    valid.append("n")
+
+    return valid
+
+
+def build_roma_table(kana_list):
+    """
+    一次性算好每个位置的合法拼法：table[i] = kana_list[i] 的拼法 tuple
+    （不可修改，盘子 / 自动机 / UI 共用）
+    """
+    return tuple(tuple(_valid_romas(kana_list, i)) for i in range(len(kana_list)))
+
+
+# ============================================================
+# 5) RomaAutomaton：把一个词编译成确定性自动机（DFA）
+# ============================================================
+
+MAX_PATHS = 40  # 单个状态最多保留的路径数（避免复杂词汇导致爆炸）
+
+
+def _step_paths(kana_list, table, paths, char):
+    """
+    多路径推进一步：返回输入 char 之后的新路径集合（没有匹配则为空）
+    """
+    n = len(kana_list)
+    new_paths = set()   # 用 set 去重：防止路径爆炸
+
+    for kana_index, buffer in paths:
+        if kana_index >= n:
+            continue
+
+        valid_romas = table[kana_index]
+        new_buffer = buffer + char
+
+        # 前缀匹配
+        if not any(r.startswith(new_buffer) for r in valid_romas):
+            continue
+
+        # 如果 buffer 完整匹配某个拼法，则提交 kana
+        if new_buffer in valid_romas:
+
+            # ---- 促音双写情况：buffer 只有一个字母，且不是 x/l ----
+            if kana_list[kana_index] == 'っ' and len(new_buffer) == 1 and new_buffer not in ('x', 'l'):
+                # 提交促音本身
+                next_index = kana_index + 1
+
+                # 决定是否“复用”这个字母作为下一个假名的首字母
+                # - 常规（pp/kk/ss/tt...）：复用
+                # - 特殊（tchi/tcha...）：不复用，只消耗促音
+                if next_index < n and any(r.startswith(char) for r in table[next_index]):
+                    new_paths.add((next_index, sys.intern(char)))
+                else:
+                    # 不可复用时（例如 char='t' 但下个是 'chi/cha'），就只完成促音，下一假名从空开始
+                    new_paths.add((next_index, ""))
+
+                continue
+
+
+            # 普通提交
+            new_paths.add((kana_index + 1, ""))
+        else:
+            new_paths.add((kana_index, sys.intern(new_buffer)))
+
+    # 限制最大路径数量（进度靠前的优先保留）；一般远小于上限，不需要排序
+    if len(new_paths) > MAX_PATHS:
+        return frozenset(heapq.nlargest(MAX_PATHS, new_paths, key=lambda p: p[0]))
+
+    return frozenset(new_paths)
+
+
+class RomaAutomaton:
+    """
+    一个词的输入判定自动机（子集构造）：
+    - 状态 = 一组多路径 (kana_index, buffer)，frozenset 直接当作 key
+    - trans[state][char] -> 下一个状态；查不到就是 MISS
+    编译一次之后，每次按键只是一次查表，与词的长度 / 歧义程度无关
+    """
+    def __init__(self, kana_list):
+        self.kana_list = kana_list
+        self.table = build_roma_table(kana_list)
+
+        # tails[i] = 从第 i 个 kana 开始的“优先拼法”拼接（UI 显示用）
+        tails = [""]
+        for valid in reversed(self.table):
+            tails.append((valid[0] if valid else "?") + tails[-1])
+        self.tails = tuple(reversed(tails))
+        self.trans = []     # state -> {char: next_state}
+        self.cleared = []   # state -> 是否已有路径完成所有 kana
+        self.best = []      # state -> UI 显示用的最佳路径 (kana_index, buffer)
+        self.width = []     # state -> 该状态包含的路径数（基准测试 / 调试用）
+        self._compile()
+
+        # next_keys[state] = 下一个按键可以是哪些字符（HUD 提示 / 键盘引导用）
+        self.next_keys = tuple(frozenset(t) for t in self.trans)
+
+        # 最短按键数（含 っ 双写、单独 n 等省键写法）；打不完的词为 None
+        self.min_len = self._shortest()
+
+    def _compile(self):
+        n = len(self.kana_list)
+        index = {}
+        states = []
+
+        def add_state(paths):
+            state = index.get(paths)
+            if state is None:
+                state = len(states)
+                index[paths] = state
+                states.append(paths)
+                self.trans.append({})
+                self.cleared.append(any(kana_index >= n for kana_index, _ in paths))
+                # 进度最大、buffer 最短优先
+                self.best.append(max(paths, key=lambda p: (p[0], -len(p[1]))))
+                self.width.append(len(paths))
+            return state
+
+        add_state(frozenset([(0, "")]))
+
+        state = 0
+        while state < len(states):
+            # 已完成的状态不再展开（盘子会直接 CLEARED）
+            if not self.cleared[state]:
+                paths = states[state]
+                for char in self._next_chars(paths):
+                    new_paths = _step_paths(self.kana_list, self.table, paths, char)
+                    if new_paths:
+                        self.trans[state][char] = add_state(new_paths)
+            state += 1
+
+    def _shortest(self):
+        """
+        DP：按输入长度一层层推进（每条边正好一个按键），
+        dist[s] = 到达状态 s 的最少按键数，第一个到达的完成状态即为答案
+        """
+        dist = [None] * len(self.trans)
+        dist[0] = 0
+        layer = [0]
+        while layer:
+            next_layer = []
+            for state in layer:
+                if self.cleared[state]:
+                    return dist[state]
+                for nxt in self.trans[state].values():
+                    if dist[nxt] is None:
+                        dist[nxt] = dist[state] + 1
+                        next_layer.append(nxt)
+            layer = next_layer
+        return None
+
+    def _next_chars(self, paths):
+        """当前状态下可能被接受的字符（按 ROMA_MAP 顺序）"""
+        chars = {}
+        # 排序只是为了让状态编号稳定（set 的遍历顺序不固定）
+        for kana_index, buffer in sorted(paths):
+            if kana_index >= len(self.kana_list):
+                continue
+            for r in self.table[kana_index]:
+                if len(r) > len(buffer) and r.startswith(buffer):
+                    chars[r[len(buffer)]] = True
+        return list(chars)
+
+    def spellings(self, limit=None):
+        """枚举所有能完成这个词的输入（最多 limit 个），离线校验 / 测试用"""
+        stack = [(0, "")]
+        while stack:
+            state, typed = stack.pop()
+            if self.cleared[state]:
+                yield typed
+                if limit is not None:
+                    limit -= 1
+                    if limit <= 0:
+                        return
+                continue
+            # 反向压栈，保证按 ROMA_MAP 顺序输出
+            for char, nxt in reversed(list(self.trans[state].items())):
+                stack.append((nxt, typed + char))
+
+    def walk(self, state, text):
+        """
+        连续输入多个字符（例如 IME 一次提交多个字母）
+        返回 (状态, 用掉的字符数)；中途打不下去返回 (None, 0)；
+        中途就打完了词时停下，后面的字符不算用掉
+        """
+        for n, char in enumerate(text, 1):
+            state = self.trans[state].get(char)
+            if state is None:
+                return None, 0
+            if self.cleared[state]:
+                return state, n
+        return state, len(text)
+
+
+AUTOMATON_CACHE_SIZE = 4096
+_automaton_cache = OrderedDict()   # kana -> RomaAutomaton（LRU）
+
+
+def compile_word(kana, kana_list=None):
+    """
+    同一个词只编译一次（盘子之间共享，不可修改）
+    kana_list：词库里预先拆好的假名（可选，省掉 split_kana）
+    """
+    automaton = _automaton_cache.get(kana)
+    if automaton is not None:
+        _automaton_cache.move_to_end(kana)
+        return automaton
+
+    automaton = RomaAutomaton(list(kana_list) if kana_list else split_kana(kana))
+    _automaton_cache[kana] = automaton
+    if len(_automaton_cache) > AUTOMATON_CACHE_SIZE:
+        _automaton_cache.popitem(last=False)
+    return automaton
+
+
+def clear_compile_cache():
+    """清空 compile_word 的缓存（基准测试量冷编译用）"""
+    _automaton_cache.clear()
 
 
 # ============================================================
-# 4) SushiPlate：寿司盘子 + 输入判定系统（多路径）
+# 6) SushiPlate：寿司盘子 + 输入判定系统（自动机）
 # ============================================================
 
 class SushiPlate:
@@ -105,53 +377,58 @@ class SushiPlate:
         # 这个 display_roma 不再作为“判定依据”，只用于 fallback/UI参考
         self.display_roma = word_data.get('roma', '').lower()
 
-        self.kana_list = split_kana(self.kana)
+        self.automaton = compile_word(self.kana, word_data.get("kana_list"))
+        self.kana_list = self.automaton.kana_list
+        self.roma_table = self.automaton.table    # 每个位置的合法拼法（只读）
 
         self.image = Resources.get_random_sushi()
         self.x = 900
         self.y = 200
+        self.prev_x = self.x   # 上一步的位置（画面插值用）
         self.speed = 3 + (len(self.display_roma) * 0.05)
 
         self.is_active = True
         self.is_cleared = False
         self.shake_amount = 0
 
-        # 多路径输入状态集合
-        self.paths = [InputPath(0, "", "")]
-        
-        typed0, remaining0 = self.get_display_text()  # 初始 typed0 应为空
-        self.target_len = len(typed0 + remaining0)
+        # 自动机当前状态（0 = 什么都没输入）
+        self.state = 0
 
         # UI 显示的“玩家真实输入内容”
         self.typed_roma = ""
 
+        # 输入版本号：每次 HIT 递增；显示文字按版本缓存
+        self.version = 0
+        self._display_version = -1
+        self._display_cache = ("", "")
+
+        # 目标长度 = 最短按键数（按词缓存在自动机里，决定价格档位）
+        min_len = self.automaton.min_len
+        self.target_len = min_len if min_len is not None else len(self.automaton.tails[0])
+
 
-    def _build_remaining_from_path(self, path):
+    def _build_remaining_from_path(self, kana_index, buffer):
         """
         根据当前路径，生成“剩余应该显示的 romaji 字符串”
         """
         remaining = ""
     
         # 1) 当前 kana：补齐当前 buffer 对应的剩余部分
-        if path.kana_index < len(self.kana_list):
-            valid = self._get_valid_romas(path.kana_index)
+        if kana_index < len(self.kana_list):
+            valid = self._get_valid_romas(kana_index)
     
             # 能匹配当前 buffer 的候选
-            candidates = [r for r in valid if r.startswith(path.buffer)]
+            candidates = [r for r in valid if r.startswith(buffer)]
             if candidates:
                 chosen = candidates[0]  # 按 ROMA_MAP 顺序优先（更像寿司打）
-                remaining += chosen[len(path.buffer):]
+                remaining += chosen[len(buffer):]
             else:
                 # 理论上不会发生；保险
                 remaining += ""
     
-        # 2) 后续 kana：直接用每个 kana 的“优先拼法”(valid[0])
-        for i in range(path.kana_index + 1, len(self.kana_list)):
-            valid = self._get_valid_romas(i)
-            if valid:
-                remaining += valid[0]
-            else:
-                remaining += "?"
+        # 2) 后续 kana：直接用每个 kana 的“优先拼法”(valid[0])，编译时已拼好
+        if kana_index + 1 < len(self.kana_list):
+            remaining += self.automaton.tails[kana_index + 1]
     
         return remaining
 
@@ -162,160 +439,61 @@ class SushiPlate:
         返回 (typed, remaining) 两段字符串
         typed：玩家已输入（红色）
         remaining：玩家未输入（灰色）
+        每帧都会调用：只有输入后（版本号变化）才重新生成
         """
-        if not self.paths:
-            return self.typed_roma, ""
+        if self._display_version != self.version:
+            # 当前最佳路径（编译时已选好：进度最大，buffer 最短优先）
+            kana_index, buffer = self.automaton.best[self.state]
 
-        # 选当前最佳路径（进度最大，buffer 最短优先）
-        best = max(self.paths, key=lambda p: (p.kana_index, len(p.typed), -len(p.buffer)))
+            typed = self.typed_roma
+            remaining = self._build_remaining_from_path(kana_index, buffer)
 
-        typed = best.typed
-        remaining = self._build_remaining_from_path(best)
+            self._display_cache = (typed, remaining)
+            self._display_version = self.version
 
-        return typed, remaining
+        return self._display_cache
     
 
-    def _get_valid_romas(self, kana_index):
+    def get_next_keys(self):
         """
-        获取当前 kana 的合法 romaji 列表（含上下文规则）
+        下一个按键可以接受的字符集合（frozenset，编译时已算好，每帧调用也没问题）
         """
-        kana = self.kana_list[kana_index]
-        valid = list(ROMA_MAP.get(kana, []))
-
-
-        # -------- 促音：っ 的双写规则（补齐 ch/sh/ts 等）--------
-        if kana == 'っ' and kana_index + 1 < len(self.kana_list):
-            next_kana = self.kana_list[kana_index + 1]
-            next_romas = ROMA_MAP.get(next_kana, [])
-        
-            # 1) 常规：允许双写“下一个拼法的首字母”（但只限辅音）
-            for r in next_romas:
-                if not r:
-                    continue
-                fc = r[0]
-                if fc.isalpha() and fc not in "aeiou":
-                    valid.append(fc)
-        
-            # 2) 特殊：当下一假名以 ch/sh/ts 开头时，额外允许 t/s
-            # 目的是支持：っち -> tchi，っちゃ -> tcha 等
-            starts = set()
-            for r in next_romas:
-                if len(r) >= 2:
-                    starts.add(r[:2])
-        
-            # ch: 允许 t（tchi/tcha/tchu/tcho）
-            if "ch" in starts:
-                valid.append("t")
-        
-            # sh: 有些规则表也允许 s（通常已包含，但保险）
-            if "sh" in starts:
-                valid.append("s")
-        
-            # ts: 通常首字母就是 t，但保险
-            if "ts" in starts:
-                valid.append("t")
-
-
-        # -------- 拨音：ん 的 n 规则（图里那套）--------
-        if kana == 'ん':
-            if kana_index + 1 < len(self.kana_list):
-                next_kana = self.kana_list[kana_index + 1]
-                next_romas = ROMA_MAP.get(next_kana, [])
-                next_firsts = [r[0] for r in next_romas if r]
+        if self.is_cleared or not self.is_active:
+            return frozenset()
+        return self.automaton.next_keys[self.state]
 
-                # 后面不是元音/y 开头，则允许单独 n
-                if next_firsts and all(c not in "aeiouy" for c in next_firsts):
-                    if "n" not in valid:
-                        valid.append("n")
 
-        return valid
+    def _get_valid_romas(self, kana_index):
+        """
+        获取当前 kana 的合法 romaji 列表（含上下文规则，预先算好）
+        """
+        return self.roma_table[kana_index]
 
 
     def check_input(self, char):
         """
-        玩家输入一个字符：更新 paths 状态集合
+        玩家输入一个字符：自动机查表转移一次
         """
         if self.is_cleared or not self.is_active:
             return "IGNORE"
 
-        new_paths = []
-
-        for path in self.paths:
-            if path.kana_index >= len(self.kana_list):
-                continue
-
-            kana = self.kana_list[path.kana_index]
-            valid_romas = self._get_valid_romas(path.kana_index)
-
-            new_buffer = path.buffer + char
-
-            # 前缀匹配
-            matched = [r for r in valid_romas if r.startswith(new_buffer)]
-            if not matched:
-                continue
-
-            p2 = path.clone()
-            p2.buffer = new_buffer
-            p2.typed += char
-
-            # 如果 buffer 完整匹配某个拼法，则提交 kana
-            if new_buffer in matched:
-
-                # ---- 促音双写情况：buffer 只有一个字母，且不是 x/l ----
-                if kana == 'っ' and len(new_buffer) == 1 and new_buffer not in ('x', 'l'):
-                    # 提交促音本身
-                    p2.kana_index += 1
-                    p2.buffer = ""
-                
-                    # 决定是否“复用”这个字母作为下一个假名的首字母
-                    # - 常规（pp/kk/ss/tt...）：复用
-                    # - 特殊（tchi/tcha...）：不复用，只消耗促音
-                    reused = False
-                    if p2.kana_index < len(self.kana_list):
-                        next_valid = self._get_valid_romas(p2.kana_index)
-                
-                        # 如果下一个假名确实有拼法以该字母开头，则走复用路径（pp, cchi 等）
-                        if any(r.startswith(char) for r in next_valid):
-                            p3 = p2.clone()
-                            p3.buffer = char
-                            new_paths.append(p3)
-                            reused = True
-                
-                    # 不可复用时（例如 char='t' 但下个是 'chi/cha'），就只完成促音，下一假名从空开始
-                    if not reused:
-                        new_paths.append(p2)
-                
-                    continue
-
-
-                # 普通提交
-                p2.kana_index += 1
-                p2.buffer = ""
-
-            new_paths.append(p2)
+        automaton = self.automaton
+        nxt = automaton.trans[self.state].get(char)
+        if nxt is None and len(char) > 1:
+            nxt, used = automaton.walk(self.state, char)
+            char = char[:used]   # 打完词之后剩下的字符不记进 typed_roma
 
         # 没有任何路径匹配 → MISS
-        if not new_paths:
+        if nxt is None:
             self.shake_amount = 10
             return "MISS"
 
-        # 去重：防止路径爆炸
-        dedup = {}
-        for p in new_paths:
-            key = (p.kana_index, p.buffer, p.typed)
-            dedup[key] = p
-
-        self.paths = list(dedup.values())
-
-        # 限制最大路径数量（避免复杂词汇导致爆炸）
-        self.paths = sorted(self.paths, key=lambda p: (p.kana_index, len(p.typed)), reverse=True)[:40]
-
-        # UI 选最佳路径（typed 最长）
-        best = max(self.paths, key=lambda p: len(p.typed))
-        self.typed_roma = best.typed
+        self.state = nxt
+        self.typed_roma += char
+        self.version += 1
 
         # 如果任何路径已经完成所有 kana
-        if any(p.kana_index >= len(self.kana_list) for p in self.paths):
+        if automaton.cleared[nxt]:
             self.is_cleared = True
             self.is_active = False
             return "CLEARED"
@@ -323,7 +501,16 @@ class SushiPlate:
         return "HIT"
 
 
+    def reset(self):
+        """回到什么都没输入的状态（多盘子模式：按键被别的盘子接走了）"""
+        if self.state == 0:
+            return
+        self.state = 0
+        self.typed_roma = ""
+        self.version += 1
+
     def update(self):
+        self.prev_x = self.x
         self.x -= self.speed
 
         if self.shake_amount > 0:
@@ -336,17 +523,110 @@ class SushiPlate:
         return False
 
 
-    def draw(self, screen, fonts):
+    def render_x(self, alpha=1.0):
+        """画面上的 x：在上一步和这一步之间插值"""
+        return self.prev_x + (self.x - self.prev_x) * alpha
+
+    def draw(self, screen, fonts, alpha=1.0):
+        """画盘子，返回画到的区域（脏矩形用；没画返回 None）"""
         if not self.is_active and not self.is_cleared:
-            return
+            return None
 
-        curr_x = self.x + (random.randint(-self.shake_amount, self.shake_amount) if self.shake_amount > 0 else 0)
+        curr_x = self.render_x(alpha) + (random.randint(-self.shake_amount, self.shake_amount) if self.shake_amount > 0 else 0)
         curr_y = self.y + (random.randint(-self.shake_amount, self.shake_amount) if self.shake_amount > 0 else 0)
 
         # 1. 寿司图
+        rect = None
         if self.image:
-            screen.blit(self.image, (curr_x, curr_y))
+            rect = screen.blit(self.image, (curr_x, curr_y))
 
         # 2. 汉字
         # k_surf = fonts['kanji'].render(self.kanji, True, (40, 40, 40))
         # screen.blit(k_surf, (curr_x + 110 - k_surf.get_width() // 2, curr_y + 40))
+
+        return rect
+
+
+# ============================================================
+# 7) 浮动提示（+N円 / COMBO / +1s / MISS）：固定大小的对象池
+# ============================================================
+
+class Popup:
+    """一个浮动提示：文字在 spawn 时渲染一次，之后每帧只改位置和透明度"""
+    __slots__ = ("active", "surf", "x", "y", "t0", "dur", "alpha")
+
+    RISE = 25     # 整个过程上浮多少像素
+    FADE = 0.3    # 最后这段（占 dur 的比例）淡出
+
+    def __init__(self):
+        self.active = False
+        self.surf = None
+        self.x = self.y = 0
+        self.t0 = 0.0
+        self.dur = 1.0
+        self.alpha = 255
+
+    def spawn(self, surf, x, y, t0, dur):
+        self.active = True
+        self.surf = surf
+        self.x, self.y = x, y
+        self.t0 = t0
+        self.dur = dur
+        self.alpha = 255
+
+    def draw(self, screen, now):
+        """画一帧，返回画到的区域；时间到了就回收（返回 None）"""
+        t = (now - self.t0) / self.dur
+        if t >= 1:
+            self.active = False
+            self.surf = None
+            return None
+
+        alpha = 255 if t < 1 - self.FADE else int(255 * (1 - t) / self.FADE)
+        if alpha != self.alpha:
+            self.surf.set_alpha(alpha)
+            self.alpha = alpha
+
+        # 上浮一点
+        rect = self.surf.get_rect(center=(self.x, self.y - int(self.RISE * t)))
+        return screen.blit(self.surf, rect)
+
+
+class PopupPool:
+    """
+    GameScene 的浮动提示都从这里借：对象数量固定，不会每帧重建列表
+    池满时复用最早出现的那个
+    """
+    def __init__(self, font, color=GOLD, size=POPUP_POOL_SIZE):
+        self.font = font
+        self.color = color
+        self.items = [Popup() for _ in range(size)]
+
+    def add(self, text, x, y, dur, now):
+        slot = None
+        for p in self.items:
+            if not p.active:
+                slot = p
+                break
+        if slot is None:
+            slot = min(self.items, key=lambda p: p.t0)
+
+        # 每个提示自己一张 Surface（要单独改透明度，不能用 TextCache 的共享 Surface）
+        surf = self.font.render(text, True, self.color)
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert_alpha()
+        slot.spawn(surf, x, y, now, dur)
+
+    def draw(self, screen, now, drawn=None):
+        """画所有活着的提示；drawn 不为 None 时把画到的区域加进去"""
+        for p in self.items:
+            if not p.active:
+                continue
+            rect = p.draw(screen, now)
+            if rect is not None and drawn is not None:
+                drawn.append(rect)
+
+    def clear(self):
+        for p in self.items:
+            p.active = False
+            p.surf = None
@@ -1,7 +1,8 @@
 import pygame
 import sys
 import os
-from .config import WIDTH, HEIGHT, BASE_DIR
+from collections import OrderedDict
+from .config import WIDTH, HEIGHT, BASE_DIR, FONT_FALLBACKS
 
 def resource_path(*parts):
     # PyInstaller onefile 会把资源解到 sys._MEIPASS
@@ -150,4 +151,89 @@ class Resources:
     @classmethod
     def set_bgm_volume(cls, v: float):
         cls._bgm_volume = max(0.0, min(1.0, float(v)))
-        pygame.mixer.music.set_volume(cls._bgm_volume) 
\ No newline at end of file
+        pygame.mixer.music.set_volume(cls._bgm_volume)
+
+
+class Fonts:
+    """
+    字体注册表：key = (path, size)，同一个字体文件 + 字号全进程只加载一次
+    （解析 .ttc 很贵，不要在 draw 里 new Font）
+    path 不存在时按 FONT_FALLBACKS 找替代字体，都找不到就用 pygame 默认字体（path=None）
+    """
+    _fonts = {}
+    _resolved = {}   # 请求的 path -> 实际加载的 path
+
+    @classmethod
+    def get(cls, path, size):
+        key = (path, size)
+        font = cls._fonts.get(key)
+        if font is None:
+            font = cls._load(cls.resolve(path), size)
+            cls._fonts[key] = font
+        return font
+
+    @classmethod
+    def resolve(cls, path):
+        """找一个实际存在的字体文件；None = pygame 默认字体"""
+        if path is None:
+            return None
+        if path in cls._resolved:
+            return cls._resolved[path]
+
+        found = path if os.path.exists(path) else None
+        if found is None:
+            for alt in FONT_FALLBACKS:
+                if os.path.sep in alt or "/" in alt:
+                    if os.path.exists(alt):
+                        found = alt
+                        break
+                else:
+                    matched = pygame.font.match_font(alt)
+                    if matched:
+                        found = matched
+                        break
+            print(f"提示: 找不到字体 {path}，改用 {found or 'pygame 默认字体'}")
+
+        cls._resolved[path] = found
+        return found
+
+    @classmethod
+    def _load(cls, path, size):
+        try:
+            return pygame.font.Font(path, size)
+        except (OSError, pygame.error) as e:
+            print(f"提示: 字体加载失败 {path}: {e}")
+            return pygame.font.Font(None, size)
+
+    @classmethod
+    def clear(cls):
+        cls._fonts.clear()
+        cls._resolved.clear()
+
+
+class TextCache:
+    """
+    font.render 结果缓存（LRU）：key = (font, text, color, antialias)
+    HUD / 按钮每帧画的大多是同样的文字，日文字体栅格化很贵，命中时直接复用 Surface
+    （返回的 Surface 是共享的，不要在上面画东西）
+    """
+    max_size = 512
+    _cache = OrderedDict()
+
+    @classmethod
+    def render(cls, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surf = cls._cache.get(key)
+        if surf is not None:
+            cls._cache.move_to_end(key)
+            return surf
+
+        surf = font.render(text, antialias, color)
+        cls._cache[key] = surf
+        if len(cls._cache) > cls.max_size:
+            cls._cache.popitem(last=False)
+        return surf
+
+    @classmethod
+    def clear(cls):
+        cls._cache.clear()
@@ -1,28 +1,43 @@
 import pygame
-import json
-import os
-import time
-import random
 from .config import *
-from .elements import Button, TextLabel, OptionBox, Slider
+from .elements import UIElement, Button, TextLabel, OptionBox, Slider
 from .game_state import GameSettings
-from .resources import Resources
-from .models import SushiPlate
+from .resources import Resources, TextCache, Fonts
+from .models import SushiPlate, PopupPool
+from .corpus import WordPoolCache, EmptySelectionError
+from .scheduler import WordScheduler
+from .conveyor import Conveyor
 
 class Scene:
     """场景基类"""
+    interp = 1.0   # 画面插值系数（0~1）：这一帧在上一次 update 和这一次之间的位置，main 每帧设置
+    idle = False   # True = 静态画面：main 阻塞等事件，只在有输入 / 外观变化 / 定时 tick 时重画
     def __init__(self):
         self.next_scene = self # 默认指向自己，表示不切换
     
     def handle_event(self, event): pass
     def update(self): pass
     def draw(self, screen): pass
+
+    def get_dirty_rects(self):
+        """这一帧画面变化的区域列表（DIRTY_RECTS 模式用）；None = 整屏刷新"""
+        return None
+
+    def invalidate(self):
+        """屏幕内容被别的场景改过了，下一帧需要整屏重画"""
+        pass
+
+    def view_state(self):
+        """画面相关状态的快照（idle 场景用）：默认收集场景上所有 UI 组件的状态"""
+        return tuple(w.view_state() for w in vars(self).values() if isinstance(w, UIElement))
     
     def switch_to(self, new_scene):
         self.next_scene = new_scene
 
 # ================= 1. 标题画面 =================
 class TitleScene(Scene):
+    idle = True
+
     def __init__(self):
         super().__init__()
         # 标题
@@ -57,49 +72,70 @@ class TitleScene(Scene):
 
 # ================= 2. 设置画面 =================
 class OptionScene(Scene):
+    idle = True
+
     def __init__(self, settings):
         super().__init__()
         self.settings = settings
         self.background = Resources.get_img("open_bg")
         
-        self.lbl_title = TextLabel(WIDTH//2, 120, "設定", font_size=50, color=BLACK)
+        self.lbl_title = TextLabel(WIDTH//2, 100, "設定", font_size=50, color=BLACK)
 
         # 难度选择
-        self.opt_diff = OptionBox(WIDTH//2 - 100, 180, 200, 50, 
+        self.opt_diff = OptionBox(WIDTH//2 - 100, 145, 200, 44, 
                                   options=["EASY", "MEDIUM", "HARD"], 
                                   label="難易度:", label_color="BLACK")
 
+        # 地域コース（只出指定地域的自治体）
+        regions = list(REGIONS)
+        region = getattr(self.settings, "region", regions[0])
+        self.opt_region = OptionBox(WIDTH//2 - 100, 195, 200, 44,
+                                    options=regions,
+                                    default_index=regions.index(region) if region in regions else 0,
+                                    label="地域:", label_color="BLACK")
+
+        # 游戏模式：MULTI = 传送带上同时有好几个盘子
+        mode = getattr(self.settings, "mode", GAME_MODES[0])
+        self.opt_mode = OptionBox(WIDTH//2 - 100, 245, 200, 44,
+                                  options=GAME_MODES,
+                                  default_index=GAME_MODES.index(mode) if mode in GAME_MODES else 0,
+                                  label="モード:", label_color="BLACK")
+
                                   
         # 罗马音显示开关（根据当前 settings 初始化）
         roma_default = 0 if getattr(self.settings, "show_roma", True) else 1
-        self.opt_roma = OptionBox(WIDTH//2 - 100, 240, 200, 50,
+        self.opt_roma = OptionBox(WIDTH//2 - 100, 295, 200, 44,
                                   options=[True, False],
                                   default_index=roma_default,
                                   label="ローマ字:", label_color="BLACK")
         
         # ふりがな 开关（新加）
         furi_default = 0 if getattr(self.settings, "furigana", True) else 1
-        self.opt_furi = OptionBox(WIDTH//2 - 100, 300, 200, 50,
+        self.opt_furi = OptionBox(WIDTH//2 - 100, 345, 200, 44,
                                   options=[True, False],
                                   default_index=furi_default,
                                   label="ふりがな:", label_color="BLACK")
         
         # ✅新增：音量滑条（SE / BGM）
-        self.sld_se = Slider(WIDTH//2 - 100, 360, 220, 40,
+        self.sld_se = Slider(WIDTH//2 - 100, 395, 220, 40,
                              label="SE:",
                              default_value=getattr(self.settings, "se_volume", 0.8), label_color="BLACK")
-        self.sld_bgm = Slider(WIDTH//2 - 100, 410, 220, 40,
+        self.sld_bgm = Slider(WIDTH//2 - 100, 435, 220, 40,
                               label="BGM:",
                               default_value=getattr(self.settings, "bgm_volume", 0.6), label_color="BLACK")
 
 
         # 开始按钮（下移）
-        self.btn_go = Button(WIDTH//2 - 100, 470, 200, 60, "GO！",
+        self.btn_go = Button(WIDTH//2 - 100, 485, 200, 60, "GO！",
                              callback=self.start_game, click_sound=None)
 
+        self.lbl_notice = None   # 开不了局时的提示（GO 按钮下方）
+
     def start_game(self):
         diff = self.opt_diff.get_value()
         self.settings.apply_difficulty(diff)
+        self.settings.region = self.opt_region.get_value()
+        self.settings.mode = self.opt_mode.get_value()
     
         self.settings.show_roma = self.opt_roma.get_value()
         self.settings.furigana = self.opt_furi.get_value()
@@ -109,14 +145,21 @@ class OptionScene(Scene):
         Resources.set_se_volume(self.settings.se_volume)
         Resources.set_bgm_volume(self.settings.bgm_volume)
     
+        self.lbl_notice = None
         try:
             Resources.play_se("go") 
             self.switch_to(GameScene(self.settings))      
+        except EmptySelectionError:
+            where = "・".join(self.settings.prefectures) if self.settings.prefectures else self.settings.region
+            self.lbl_notice = TextLabel(WIDTH//2, 565, f"{diff} には「{where}」の自治体がありません",
+                                        font_size=22, color=WHITE)
         except Exception as e:
             print(f"DEBUG: 进入游戏失败: {e}")
 
     def update(self):
         self.opt_diff.update()
+        self.opt_region.update()
+        self.opt_mode.update()
         self.opt_roma.update()
         self.opt_furi.update()
         self.sld_se.update()
@@ -132,6 +175,8 @@ class OptionScene(Scene):
 
         self.lbl_title.draw(screen)
         self.opt_diff.draw(screen)
+        self.opt_region.draw(screen)
+        self.opt_mode.draw(screen)
         self.opt_roma.draw(screen)
         self.opt_furi.draw(screen)
 
@@ -139,10 +184,16 @@ class OptionScene(Scene):
         self.sld_bgm.draw(screen)
 
         self.btn_go.draw(screen)
+        if self.lbl_notice:
+            # 下面是红色花纹，垫一块底色
+            pygame.draw.rect(screen, RED, self.lbl_notice.rect.inflate(20, 8), border_radius=6)
+            self.lbl_notice.draw(screen)
 
 
     def handle_event(self, event):
         self.opt_diff.handle_event(event)
+        self.opt_region.handle_event(event)
+        self.opt_mode.handle_event(event)
         self.opt_roma.handle_event(event)
         self.opt_furi.handle_event(event)
 
@@ -185,18 +236,37 @@ class PauseScene(Scene):
                               label="BGM:",
                               default_value=getattr(self.game_scene.settings, "bgm_volume", 0.6))
 
+        self.snapshot = None   # 暂停那一刻的游戏画面（已经叠好遮罩），第一次 draw 时截
+
         
         
 
+    def capture(self):
+        """把游戏画面 + 半透明遮罩合成一张图，暂停期间每帧只贴这一张"""
+        snap = pygame.Surface((WIDTH, HEIGHT))
+        self.game_scene.invalidate()
+        self.game_scene.draw(snap)
+
+        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 160)) # 稍微深一点，更有暂停感
+        snap.blit(overlay, (0, 0))
+        return snap.convert() if pygame.display.get_surface() is not None else snap
+
+    def release(self):
+        self.snapshot = None
+
     def retry_game(self):
         # 重新开始，直接创建一个全新的场景，不会有指针残留问题
+        self.release()
         self.switch_to(GameScene(self.game_scene.settings))
 
     def go_to_title(self):
+        self.release()
         self.switch_to(TitleScene())
 
     def resume_game(self):
         # --- 修复无限切换的核心 ---
+        self.release()
         self.game_scene.next_scene = self.game_scene 
         self.switch_to(self.game_scene)
 
@@ -224,12 +294,10 @@ class PauseScene(Scene):
         Resources.set_bgm_volume(self.game_scene.settings.bgm_volume)
 
     def draw(self, screen):
-        # 绘制背景
-        self.game_scene.draw(screen)
-        
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 160)) # 稍微深一点，更有暂停感
-        screen.blit(overlay, (0, 0))
+        # 绘制背景：暂停时截好的画面
+        if self.snapshot is None:
+            self.snapshot = self.capture()
+        screen.blit(self.snapshot, (0, 0))
         
         self.lbl_pause.draw(screen)
 
@@ -246,6 +314,20 @@ class PauseScene(Scene):
 
 # ================= 3. 游戏画面 =================
 class GameScene(Scene):
+    # ================= 轨道 / HUD 参数（在这里统一调） =================
+    BELT_Y = 215   # 轨道整体y（越小越靠上）
+    BELT_H = 160
+    BELT_ALPHA = 120  # ✅你想更透明就调小（0~255）
+
+    HUD_X = WIDTH // 2 - 200   # 左上角 X（改这里左右移动）
+    HUD_Y = 380               # 左上角 Y（改这里上下移动）
+    HUD_W = 400               # HUD 宽度
+    HUD_H = 150               # HUD 高度
+    HUD_RADIUS = 15           # 圆角半径
+    HUD_ALPHA = 100           # 透明度（0~255，越小越透明）
+    HUD_TEXT_DY = 20
+    # ============================================================
+
     def __init__(self, settings):
         super().__init__()
         self.settings = settings
@@ -253,7 +335,8 @@ class GameScene(Scene):
         # ===== 连打/奖励系统 =====
         self.combo = 0
         self.time_bonus = 0  # 已获得的额外时间（秒），参与倒计时
-        self.popups = []     # 浮动提示：[{text,x,y,t0,dur}]
+        self._prev_rects = None   # 上一帧画过的区域（脏矩形模式；None = 下一帧整屏重画）
+        self._dirty_rects = None
         self.popup_base_y = 340
 
         
@@ -263,44 +346,129 @@ class GameScene(Scene):
         self.total_words_cleared = 0
         
         self.words_pool = self.load_words()
-        self.start_time = time.time()
+        self.scheduler = self.make_scheduler()
+        self.sim_time = 0.0   # 游戏内时间（每次 update 推进 SIM_DT；暂停时不走）
         self.time_left = self.settings.time_limit 
         self.current_plate = None
+        self.plate_queue = []   # 预先造好的下一个盘子（空闲帧里准备）
         self.game_over = False
         
         self.fonts = {
-            'kanji': pygame.font.Font(FONT_PATH, 48),
-            'furi': pygame.font.Font(FONT_PATH, 26),  # 新增：ふりがな
-            'roma': pygame.font.Font(None, 40),
-            'ui': pygame.font.Font(FONT_PATH, 28),
-            'popup': pygame.font.Font(FONT_PATH, 26)
+            'kanji': Fonts.get(FONT_PATH, 48),
+            'furi': Fonts.get(FONT_PATH, 26),  # 新增：ふりがな
+            'roma': Fonts.get(None, 40),
+            'ui': Fonts.get(FONT_PATH, 28),
+            'popup': Fonts.get(FONT_PATH, 26)
         }
-        self.spawn_plate()
+        self.popups = PopupPool(self.fonts['popup'])   # 浮动提示（固定大小的对象池）
+
+        # 多盘子模式：盘子交给传送带管理，current_plate 只是 HUD 上显示的那个
+        self.conveyor = None
+        if getattr(self.settings, "mode", "NORMAL") == "MULTI":
+            self.conveyor = Conveyor(self.next_plate, show_roma=getattr(self.settings, "show_roma", True))
+            self.conveyor.spawn()
+            self.current_plate = self.conveyor.focus()
+        else:
+            self.spawn_plate()
         self.background = Resources.get_img("game_bg")
+        self.build_layers()
         Resources.set_se_volume(getattr(self.settings, "se_volume", 0.8))
         Resources.set_bgm_volume(getattr(self.settings, "bgm_volume", 0.6))
 
     # src/scenes.py 中的 GameScene 类
 
+    def get_dirty_rects(self):
+        return self._dirty_rects if DIRTY_RECTS else None
+
+    def invalidate(self):
+        self._prev_rects = None
+
+    def build_layers(self):
+        """
+        静态的半透明图层只合成一次（创建场景 / 窗口大小变化时调用）：
+        - frame_base：背景 + 轨道，每帧整张贴一次
+        - hud_layer：HUD 底板
+        """
+        can_convert = pygame.display.get_surface() is not None
+
+        base = pygame.Surface((WIDTH, HEIGHT))
+        if getattr(self, "background", None):
+            base.blit(self.background, (0, 0))
+        else:
+            base.fill(BG_COLOR)
+
+        # 1. 轨道（可控透明度）
+        belt = pygame.Surface((WIDTH, self.BELT_H), pygame.SRCALPHA)
+
+        # 背景填充（RGBA）
+        belt.fill((255, 255, 255, self.BELT_ALPHA))
+
+        # 边线（也用 RGBA）
+        pygame.draw.line(belt, (210, 210, 210, self.BELT_ALPHA), (0, 0), (WIDTH, 0), 3)
+        pygame.draw.line(belt, (210, 210, 210, self.BELT_ALPHA), (0, self.BELT_H - 1), (WIDTH, self.BELT_H - 1), 3)
+
+        base.blit(belt, (0, self.BELT_Y))
+        self.frame_base = base.convert() if can_convert else base
+
+        # 2. HUD 底板（支持透明度）
+        hud_surf = pygame.Surface((self.HUD_W, self.HUD_H), pygame.SRCALPHA)
+
+        # HUD 背景（RGBA）
+        hud_surf.fill((255, 255, 255, self.HUD_ALPHA))
+
+        # HUD 边框
+        pygame.draw.rect(
+            hud_surf,
+            (200, 200, 200, self.HUD_ALPHA),
+            hud_surf.get_rect(),
+            2,
+            border_radius=self.HUD_RADIUS
+        )
+        self.hud_layer = hud_surf.convert_alpha() if can_convert else hud_surf
+
     def load_words(self):
-        # 根据难度加载不同文件
-        filename = f"words_{self.settings.difficulty.lower()}.json"
-        path = os.path.join(DATA_DIR, filename)
+        # 根据难度加载不同文件（进程内缓存；有编译好的 .bin 时用 mmap 打开）
+        # 选了地域コース时，只取这些都道府県的词（下标视图，不复制）
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            print(f"Error loading {path}")
+            return WordPoolCache.select(self.settings.difficulty, self.settings.get_prefectures())
+        except EmptySelectionError:
+            raise   # 选的地域没有词：交给设置画面提示，不偷偷换成别的词
+        except Exception as e:
+            print(f"Error loading words ({self.settings.difficulty}): {e}")
             return [{"kanji": "测试", "kana": "てすと", "roma": "test"}]
 
-    def spawn_plate(self):
-        """生成一个新的盘子"""
+    def make_scheduler(self):
+        """出词器：按コース配置的档位权重抽词（子类 / 自定义コース可以换掉）"""
+        conf = COURSE_SCHEDULES.get(self.settings.difficulty, {})
+        return WordScheduler(self.words_pool,
+                             weights=conf.get("weights"),
+                             ramp=conf.get("ramp", 0.0))
+
+    def build_plate(self):
+        """选词并造好一个盘子（自动机 / 显示文字都准备好）"""
         if not self.words_pool:
             self.words_pool = self.load_words() # 重新加载或循环
-            
-        import random
-        word_data = random.choice(self.words_pool)
-        self.current_plate = SushiPlate(word_data)
+            self.scheduler = self.make_scheduler()
+
+        word_data = self.scheduler.draw(self.combo)
+        plate = SushiPlate(word_data)
+        plate.get_display_text()
+        return plate
+
+    def prefetch_plate(self):
+        """空闲帧里把下一个盘子提前造好"""
+        while len(self.plate_queue) < PLATE_PREFETCH:
+            self.plate_queue.append(self.build_plate())
+
+    def next_plate(self):
+        """取下一个盘子（有预先造好的就直接用）"""
+        if self.plate_queue:
+            return self.plate_queue.pop(0)
+        return self.build_plate()
+
+    def spawn_plate(self):
+        """生成一个新的盘子"""
+        self.current_plate = self.next_plate()
 
     def handle_event(self, event):
         if self.game_over:
@@ -314,13 +482,26 @@ class GameScene(Scene):
         # 只处理文字输入（支持 IME/更稳定）
         if event.type != pygame.TEXTINPUT:
             return
+
+        ch = event.text.lower()
+
+        # 多盘子模式：逐个字符交给传送带分发
+        if self.conveyor is not None:
+            for c in ch:
+                result, plates = self.conveyor.feed(c)
+                self.apply_result(result, plates)
+            self.current_plate = self.conveyor.focus()
+            return
+
         if not self.current_plate:
             return
     
         # 关键：先拿到 result
-        ch = event.text.lower()
         result = self.current_plate.check_input(ch)
-    
+        self.apply_result(result, [self.current_plate])
+
+    def apply_result(self, result, plates):
+        """按键判定结果 → 计分 / 连打 / 提示（两种模式共用）"""
         if result == "HIT":
             self.correct_keys += 1
     
@@ -338,41 +519,48 @@ class GameScene(Scene):
     
         elif result == "CLEARED":
             self.correct_keys += 1
+            for plate in plates:
+                self.on_plate_cleared(plate)
+
+            # 5) 下一个词（多盘子模式由传送带补盘）
+            if self.conveyor is None:
+                self.spawn_plate()
+
+    def on_plate_cleared(self, plate):
+        """打完一个盘子：连打 / 计分 / 加时"""
+        # 1) combo +1
+        self.combo += 1
+        Resources.play_combo(self.combo)  
     
-            # 1) combo +1
-            self.combo += 1
-            Resources.play_combo(self.combo)  
-    
-    
-            # 2) base 由长度档位决定
-            L = getattr(self.current_plate, "target_len", len(getattr(self.current_plate, "display_roma", "")))
-            base = self.base_price_by_len(L)
     
-            # 3) gain = base * (1 + 0.08*min(combo,25))
-            mult = 1 + COMBO_STEP * min(self.combo, COMBO_CAP)
-            gain = int(base * mult)
-            self.score += gain
+        # 2) base 由长度档位决定
+        L = getattr(plate, "target_len", len(getattr(plate, "display_roma", "")))
+        base = self.base_price_by_len(L)
     
-            # 提示：+分 & combo
-            self.add_popup(f"+{gain}円", WIDTH//2, 360, dur=0.9)
-            if self.combo >= 2:
-                self.add_popup(f"COMBO {self.combo}", WIDTH//2, 330, dur=0.8)
+        # 3) gain = base * (1 + 0.08*min(combo,25))
+        mult = 1 + COMBO_STEP * min(self.combo, COMBO_CAP)
+        gain = int(base * mult)
+        self.score += gain
     
-            # 4) 小额加时（每10连 +1s，整局最多+10s）
-            if (self.combo % TIME_BONUS_EVERY == 0) and (self.time_bonus < TIME_BONUS_CAP):
-                self.time_bonus += TIME_BONUS_AMOUNT
-                self.add_popup("+1s", WIDTH//2 + 140, 360, dur=0.9)
+        # 提示：+分 & combo
+        self.add_popup(f"+{gain}円", WIDTH//2, 360, dur=0.9)
+        if self.combo >= 2:
+            self.add_popup(f"COMBO {self.combo}", WIDTH//2, 330, dur=0.8)
     
-            # 5) 下一个词
-            self.total_words_cleared += 1
-            self.spawn_plate()
+        # 4) 小额加时（每10连 +1s，整局最多+10s）
+        if (self.combo % TIME_BONUS_EVERY == 0) and (self.time_bonus < TIME_BONUS_CAP):
+            self.time_bonus += TIME_BONUS_AMOUNT
+            self.add_popup("+1s", WIDTH//2 + 140, 360, dur=0.9)
+
+        self.total_words_cleared += 1
 
         
                         
                 
     def update(self):
         if self.game_over: return
-        elapsed = time.time() - self.start_time
+        self.sim_time += SIM_DT
+        elapsed = self.sim_time
         total_limit = self.settings.time_limit + self.time_bonus
         self.time_left = max(0, total_limit - elapsed)
 
@@ -390,51 +578,47 @@ class GameScene(Scene):
             self.switch_to(ResultScene(self.settings, stats))
             return 
 
-        if self.current_plate:
+        if self.conveyor is not None:
+            for _ in self.conveyor.update():
+                self.on_plate_lost()
+            self.current_plate = self.conveyor.focus()
+        elif self.current_plate:
             if self.current_plate.update():  # 盘子流失（算未完成）
-                self.miss_keys += 1
-                self.score = max(0, self.score - 10)  # 可选：漏盘也扣一点分
-                Resources.play_se("miss")
-        
-                # 连打惩罚：减半（你也可以改成 0）
-                self.combo = 0
-        
-                # 提示：MISS
-                self.add_popup("MISS", WIDTH//2, self.popup_base_y, dur=0.8)
-        
-                # combo 断了再提示 COMBO BREAK
-                if self.combo == 0:
-                    self.add_popup("COMBO BREAK", WIDTH//2, self.popup_base_y - 30, dur=0.8)
-        
+                self.on_plate_lost()
                 self.spawn_plate()
 
+        # 没有按键的空闲时间里准备下一个盘子，CLEARED 时只需要换上
+        self.prefetch_plate()
 
 
-    def draw(self, screen):
-        # 核心修改：白色背景
-        if getattr(self, "background", None):
-            screen.blit(self.background, (0, 0))
-        else:
-            screen.fill(BG_COLOR)
-        BELT_Y = 215   # 轨道整体y（越小越靠上）
-        BELT_H = 160
-        HUD_Y  = 380   # HUD整体y（越小越靠上）
-        HUD_TEXT_DY = 20
 
-        
-        # 1. 轨道（可控透明度）
-        BELT_ALPHA = 120  # ✅你想更透明就调小（0~255）
+    def on_plate_lost(self):
+        """盘子流走（算未完成）"""
+        self.miss_keys += 1
+        self.score = max(0, self.score - 10)  # 可选：漏盘也扣一点分
+        Resources.play_se("miss")
 
-        belt = pygame.Surface((WIDTH, BELT_H), pygame.SRCALPHA)
+        # 连打惩罚：减半（你也可以改成 0）
+        self.combo = 0
 
-        # 背景填充（RGBA）
-        belt.fill((255, 255, 255, BELT_ALPHA))
+        # 提示：MISS
+        self.add_popup("MISS", WIDTH//2, self.popup_base_y, dur=0.8)
 
-        # 边线（也用 RGBA）
-        pygame.draw.line(belt, (210, 210, 210, BELT_ALPHA), (0, 0), (WIDTH, 0), 3)
-        pygame.draw.line(belt, (210, 210, 210, BELT_ALPHA), (0, BELT_H - 1), (WIDTH, BELT_H - 1), 3)
+        # combo 断了再提示 COMBO BREAK
+        if self.combo == 0:
+            self.add_popup("COMBO BREAK", WIDTH//2, self.popup_base_y - 30, dur=0.8)
 
-        screen.blit(belt, (0, BELT_Y))
+    def draw(self, screen):
+        # 1. 背景 + 轨道（build_layers 里预先合成好）
+        #    脏矩形模式下只用底图擦掉上一帧画过的区域
+        if DIRTY_RECTS and self._prev_rects is not None:
+            for r in self._prev_rects:
+                screen.blit(self.frame_base, r, r)
+        else:
+            screen.blit(self.frame_base, (0, 0))
+        drawn = []   # 这一帧画过的区域
+        HUD_Y = self.HUD_Y
+        HUD_TEXT_DY = self.HUD_TEXT_DY
 
 
 
@@ -455,25 +639,25 @@ class GameScene(Scene):
 
         # 金额
         score_text = f"金額: {self.score} 円"
-        score_surf = self.fonts['ui'].render(score_text, True, SCORE_COLOR)
-        screen.blit(score_surf, (HUD_INFO_X, HUD_INFO_Y))
+        score_surf = TextCache.render(self.fonts['ui'], score_text, SCORE_COLOR)
+        drawn.append(screen.blit(score_surf, (HUD_INFO_X, HUD_INFO_Y)))
 
         # 剩余时间（右对齐靠右）
         time_text = f"残り: {int(self.time_left)}s"
-        time_surf = self.fonts['ui'].render(time_text, True, TIME_COLOR)
-        screen.blit(
+        time_surf = TextCache.render(self.fonts['ui'], time_text, TIME_COLOR)
+        drawn.append(screen.blit(
             time_surf,
             (WIDTH - TIME_RIGHT_MARGIN, HUD_INFO_Y)
-        )
+        ))
 
         # COMBO（>=2 才显示）
         if self.combo >= 2:
             combo_text = f"COMBO: {self.combo}"
-            combo_surf = self.fonts['ui'].render(combo_text, True, COMBO_COLOR)
-            screen.blit(
+            combo_surf = TextCache.render(self.fonts['ui'], combo_text, COMBO_COLOR)
+            drawn.append(screen.blit(
                 combo_surf,
                 (HUD_INFO_X, HUD_INFO_Y + HUD_INFO_LINE_H)
-            )
+            ))
 
 
 
@@ -482,41 +666,16 @@ class GameScene(Scene):
 
         # 3. 焦点输入框 (HUD)
         if self.current_plate and not self.game_over:
-            # ================= HUD 参数（在这里统一调） =================
-            HUD_X = WIDTH // 2 - 200   # 左上角 X（改这里左右移动）
-            HUD_Y = 380               # 左上角 Y（改这里上下移动）
-            HUD_W = 400               # HUD 宽度
-            HUD_H = 150               # HUD 高度
-            HUD_RADIUS = 15           # 圆角半径
-            HUD_ALPHA = 100           # 透明度（0~255，越小越透明）
-
-            # ============================================================
-
-            # 创建一个支持透明度的 HUD Surface
-            hud_surf = pygame.Surface((HUD_W, HUD_H), pygame.SRCALPHA)
-
-            # HUD 背景（RGBA）
-            hud_surf.fill((255, 255, 255, HUD_ALPHA))
-
-            # HUD 边框
-            pygame.draw.rect(
-                hud_surf,
-                (200, 200, 200, HUD_ALPHA),
-                hud_surf.get_rect(),
-                2,
-                border_radius=HUD_RADIUS
-            )
-
-            # 贴到主屏幕
-            screen.blit(hud_surf, (HUD_X, HUD_Y))
+            # HUD 底板（build_layers 里预先画好）
+            drawn.append(screen.blit(self.hud_layer, (self.HUD_X, HUD_Y)))
 
             
             # ====== HUD：都道府县（浅色）+ 市町村（深色） ======
             pref = getattr(self.current_plate, "prefix_kanji", "")
             name = self.current_plate.kanji
             
-            pref_surf = self.fonts['kanji'].render(pref, True, (170, 170, 170))
-            name_surf = self.fonts['kanji'].render(name, True, BLACK)
+            pref_surf = TextCache.render(self.fonts['kanji'], pref, (170, 170, 170))
+            name_surf = TextCache.render(self.fonts['kanji'], name, BLACK)
             
             total_w_name = pref_surf.get_width() + name_surf.get_width()
             name_start_x = WIDTH // 2 - total_w_name // 2
@@ -525,54 +684,48 @@ class GameScene(Scene):
             pref_x = name_start_x
             name_x = name_start_x + pref_surf.get_width()
             
-            screen.blit(pref_surf, (pref_x, y_name))
-            screen.blit(name_surf, (name_x, y_name))
+            drawn.append(screen.blit(pref_surf, (pref_x, y_name)))
+            drawn.append(screen.blit(name_surf, (name_x, y_name)))
             
             # ====== ふりがな：只对准市町村部分（name） ======
             if getattr(self.settings, "furigana", True):
                 furi_text = getattr(self.current_plate, "kana", "")
-                f_surf = self.fonts['furi'].render(furi_text, True, (120, 120, 120))
+                f_surf = TextCache.render(self.fonts['furi'], furi_text, (120, 120, 120))
             
                 name_center_x = name_x + name_surf.get_width() // 2
                 f_x = name_center_x - f_surf.get_width() // 2
                 f_y = y_name - 28  # 控制ふりがな高度
             
-                screen.blit(f_surf, (f_x, f_y))
+                drawn.append(screen.blit(f_surf, (f_x, f_y)))
             
             # ====== ローマ字：红色已输入 + 灰色未输入 ======
             if getattr(self.settings, "show_roma", True):
                 typed, remaining = self.current_plate.get_display_text()
             
-                t_surf = self.fonts['roma'].render(typed, True, RED)
-                u_surf = self.fonts['roma'].render(remaining, True, (150, 150, 150))
+                t_surf = TextCache.render(self.fonts['roma'], typed, RED)
+                u_surf = TextCache.render(self.fonts['roma'], remaining, (150, 150, 150))
             
                 total_w_roma = t_surf.get_width() + u_surf.get_width()
                 roma_start_x = WIDTH // 2 - total_w_roma // 2
                 roma_y = HUD_Y + 75 + HUD_TEXT_DY  # 现在跟 HUD_Y 联动
             
-                screen.blit(t_surf, (roma_start_x, roma_y))
-                screen.blit(u_surf, (roma_start_x + t_surf.get_width(), roma_y))
+                drawn.append(screen.blit(t_surf, (roma_start_x, roma_y)))
+                drawn.append(screen.blit(u_surf, (roma_start_x + t_surf.get_width(), roma_y)))
                 
-        now = time.time()
-        alive = []
-        for p in self.popups:
-            t = (now - p["t0"]) / p["dur"]
-            if t >= 1:
-                continue
-        
-            # 上浮一点
-            y = p["y"] - int(25 * t)
-        
-            surf = self.fonts.get("popup", self.fonts["ui"]).render(p["text"], True, GOLD)
-            rect = surf.get_rect(center=(p["x"], y))
-            screen.blit(surf, rect)
-        
-            alive.append(p)
-        
-        self.popups = alive
+        # 多盘子模式的盘子铺满两条轨道，提示要画在盘子上面
+        if self.conveyor is not None:
+            drawn.extend(self.conveyor.draw(screen, self.interp))
+
+        self.popups.draw(screen, self.sim_time, drawn)
             
-        if self.current_plate:
-            self.current_plate.draw(screen, self.fonts)
+        if self.conveyor is None and self.current_plate:
+            rect = self.current_plate.draw(screen, self.fonts, self.interp)
+            if rect:
+                drawn.append(rect)
+
+        # 要刷新的区域 = 上一帧画过的（已擦掉）+ 这一帧画的；整屏重画时为 None
+        self._dirty_rects = None if self._prev_rects is None else self._prev_rects + drawn
+        self._prev_rects = drawn
 
         
 
@@ -584,12 +737,14 @@ class GameScene(Scene):
         return PRICE_TIERS[-1][1]
 
     def add_popup(self, text, x, y, dur=0.9):
-        self.popups.append({"text": text, "x": x, "y": y, "t0": time.time(), "dur": dur})
+        self.popups.add(text, x, y, dur, self.sim_time)
 
 
 
 # ================= 4. 结算画面 =================
 class ResultScene(Scene):
+    idle = True
+
     def __init__(self, settings, stats):
         super().__init__()
         self.settings = settings
@@ -688,23 +843,23 @@ class ResultScene(Scene):
         screen.blit(panel_surf, (PANEL_X, PANEL_Y))
 
         # 3) 字体
-        font_main = pygame.font.Font(FONT_PATH, FONT_MAIN_SIZE)
-        font_sub = pygame.font.Font(FONT_PATH, FONT_SUB_SIZE)
+        font_main = Fonts.get(FONT_PATH, FONT_MAIN_SIZE)
+        font_sub = Fonts.get(FONT_PATH, FONT_SUB_SIZE)
 
         # 4) 标题与课程
         header_text = f"{self.settings.difficulty} {self.cost}円コース"
-        h_surf = font_sub.render(header_text, True, TEXT_MAIN_COLOR)
+        h_surf = TextCache.render(font_sub, header_text, TEXT_MAIN_COLOR)
         screen.blit(h_surf, (WIDTH//2 - h_surf.get_width()//2, HEADER_Y))
 
         # 5) 盈亏说明行
         res_text = f"{self.earned} 円分ゲット！ - {self.cost} 円払って..."
-        r_surf = font_sub.render(res_text, True, TEXT_SUB_COLOR)
+        r_surf = TextCache.render(font_sub, res_text, TEXT_SUB_COLOR)
         screen.blit(r_surf, (WIDTH//2 - r_surf.get_width()//2, RESULT_TEXT_Y))
 
         # 6) 盈亏大字
         profit_color = PROFIT_POS_COLOR if self.profit >= 0 else PROFIT_NEG_COLOR
         profit_msg = f"{abs(self.profit)} 円{'分お得でした！' if self.profit >= 0 else '分損でした...'}"
-        p_surf = font_main.render(profit_msg, True, profit_color)
+        p_surf = TextCache.render(font_main, profit_msg, profit_color)
         screen.blit(p_surf, (WIDTH//2 - p_surf.get_width()//2, PROFIT_Y))
 
         # 7) 底部统计三列
@@ -715,8 +870,8 @@ class ResultScene(Scene):
         for i in range(3):
             lx = int(col_centers[i])
 
-            l_surf = font_sub.render(stats_labels[i], True, LABEL_COLOR)
-            v_surf = font_main.render(stats_vals[i], True, TEXT_MAIN_COLOR)
+            l_surf = TextCache.render(font_sub, stats_labels[i], LABEL_COLOR)
+            v_surf = TextCache.render(font_main, stats_vals[i], TEXT_MAIN_COLOR)
 
             screen.blit(l_surf, (lx - l_surf.get_width()//2, STATS_Y + STATS_LABEL_DY))
             screen.blit(v_surf, (lx - v_surf.get_width()//2, STATS_Y + STATS_VALUE_DY))
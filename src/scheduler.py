@@ -0,0 +1,206 @@
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from .config import PRICE_TIERS, COMBO_CAP
+from .corpus import price_tier
+
+# ============================================================
+# 出词调度：按价格档位建索引 + 洗牌袋（一轮内不重复）
+# ============================================================
+
+_INDEX_CACHE_SIZE = 4
+_index_cache = OrderedDict()   # id(pool) -> (pool, 索引)，同一个词库只建一次索引
+
+
+def _known_min_len(pool, i):
+    """
+    第 i 个词现成的最短按键数：二进制词库 / build_corpus 生成的 json 里有；
+    没有就返回 None（不在这里编译自动机，开局不能卡）
+    """
+    min_len_of = getattr(pool, "min_len_of", None)
+    if min_len_of is not None:
+        return min_len_of(i)
+    return pool[i].get("min_len")
+
+
+def _estimate_len(word):
+    """没有 min_len 时的粗略长度（优先拼法的长度），后台算出准确值后再换档"""
+    roma = word.get("roma")
+    if roma:
+        return len(roma)
+    return 2 * len(word["kana"])
+
+
+def extend_index(pool, index, limit=None):
+    """
+    把 pool 里还没建索引的词补进索引（流式词库会慢慢变长）；最多补 limit 个
+    没有现成 min_len 的词先按估计长度放进档位，记在 pending 里交给后台线程算准
+    调用方要持有 index["lock"]
+    """
+    start = index["count"]
+    stop = len(pool) if limit is None else min(len(pool), start + limit)
+    for i in range(start, stop):
+        L = _known_min_len(pool, i)
+        if L is None:
+            tier = price_tier(_estimate_len(pool[i]))
+            index["pending"][i] = (tier, len(index["tiers"][tier]))
+        elif not L:
+            continue
+        else:
+            tier = price_tier(L)
+        index["tiers"][tier].append(i)
+    index["count"] = stop
+
+    if index["pending"] and index["worker"] is None:
+        index["worker"] = threading.Thread(target=_refine_worker, args=(pool, index),
+                                           name="word-index", daemon=True)
+        index["worker"].start()
+    return stop - start
+
+
+def _move(index, i, old, pos, new):
+    """把第 i 个词从档位 old（位置 pos）挪到 new（None = 移出索引）；和末尾交换，O(1)"""
+    tier = index["tiers"][old]
+    last = tier.pop()
+    if last != i:
+        tier[pos] = last
+        if last in index["pending"]:
+            index["pending"][last] = (old, pos)
+    if new is not None:
+        index["tiers"][new].append(i)
+    index["moved"][i] = new
+    index["version"] += 1
+
+
+def _refine_worker(pool, index):
+    """
+    后台线程：逐个编译 pending 词的自动机，把它们挪到准确的档位（打不完的词移出索引）
+    编译在锁外做；每个词之后让出 GIL，不拖慢游戏线程的帧
+    """
+    from .models import RomaAutomaton, split_kana
+
+    lock = index["lock"]
+    pending = index["pending"]
+    while True:
+        with lock:
+            if not pending:
+                index["worker"] = None
+                return
+            # 只有这个线程会移动词，所以锁外编译期间 i 的位置 pos 不会变
+            i, (guess, pos) = pending.popitem()
+            word = pool[i]
+
+        # 不走 compile_word 的 LRU：那个缓存只给游戏线程用
+        kana_list = word.get("kana_list") or split_kana(word["kana"])
+        L = RomaAutomaton(list(kana_list)).min_len or 0
+        tier = price_tier(L) if L else None
+
+        if tier != guess:
+            with lock:
+                _move(index, i, guess, pos, tier)
+        time.sleep(0)
+
+
+def build_index(pool):
+    """
+    tiers[t] = 价格档位 t 的词下标列表
+    pending = {下标: (估计档位, 在档位列表里的位置)}，后台线程还没算准的词
+    moved = {下标: 新档位 / None}，算准后换过档的词；version 每换一次 +1
+    打不完的词（min_len 为 0）不进索引
+    """
+    cached = _index_cache.get(id(pool))
+    if cached and cached[0] is pool:
+        _index_cache.move_to_end(id(pool))
+        return cached[1]
+
+    index = {"tiers": [[] for _ in PRICE_TIERS], "pending": {}, "moved": {},
+             "version": 0, "count": 0, "lock": threading.Lock(), "worker": None}
+    with index["lock"]:
+        extend_index(pool, index)
+
+    _index_cache[id(pool)] = (pool, index)
+    if len(_index_cache) > _INDEX_CACHE_SIZE:
+        _index_cache.popitem(last=False)
+    return index
+
+
+class WordScheduler:
+    """
+    出词器：GameScene.build_plate 通过 draw(combo) 取下一个词
+    - weights：每个价格档位的权重（None = 按档位词数，等价于整体随机）
+    - ramp：combo 越高越偏向高档位（长词）；0 = 不变
+    每个档位一个洗牌袋，袋子抽空再重新洗，所以一轮内不会重复
+    词库还在后台变长时（StreamingWordPool），每次抽词顺便把新词补进索引
+    （蓄水池替换掉的位置档位可能不准，只影响抽词权重）
+    没有现成 min_len 的 json 词库先按估计长度分档，后台线程算准后换档；
+    换了档 / 打不完的词同时从袋子里拿掉，下次洗牌才进新档位的袋子
+    """
+    INDEX_STEP = 32    # 每次抽词最多补多少个新词的索引
+
+    def __init__(self, pool, weights=None, ramp=0.0, rng=None):
+        self.pool = pool
+        self.rng = rng or random.Random()
+        self.index = build_index(pool)
+        self.tiers = self.index["tiers"]
+
+        self.base_weights = weights
+        self.ramp = ramp
+        self._version = self.index["version"]
+        self._update_weights()
+
+        self._bags = [[] for _ in self.tiers]
+        self._last = None
+
+    def _update_weights(self):
+        weights = self.base_weights
+        if weights is None:
+            weights = [len(t) for t in self.tiers]
+        # 空档位权重为 0
+        self.weights = [w if self.tiers[t] else 0 for t, w in enumerate(weights)]
+
+    def _tier_weights(self, combo):
+        if not self.ramp:
+            return self.weights
+        boost = self.ramp * min(combo, COMBO_CAP)
+        return [w * (1 + boost * t) for t, w in enumerate(self.weights)]
+
+    def _drop_moved(self):
+        """袋子里去掉已经不属于这个档位的词（后台换档 / 移出索引）"""
+        moved = self.index["moved"]
+        for t, bag in enumerate(self._bags):
+            if bag:
+                self._bags[t] = [i for i in bag if moved.get(i, t) == t]
+
+    def draw(self, combo=0):
+        """抽一个词（dict）"""
+        with self.index["lock"]:
+            changed = False
+            if len(self.pool) > self.index["count"]:
+                extend_index(self.pool, self.index, self.INDEX_STEP)
+                changed = True
+            if self.index["version"] != self._version:
+                self._version = self.index["version"]
+                self._drop_moved()
+                changed = True
+            if changed:
+                self._update_weights()
+
+            weights = self._tier_weights(combo)
+            if not any(weights):
+                # 索引是空的（例如全是打不完的词）：退回整体随机
+                return self.rng.choice(self.pool)
+
+            tier = self.rng.choices(range(len(weights)), weights=weights)[0]
+            bag = self._bags[tier]
+            if not bag:
+                bag.extend(self.tiers[tier])
+                self.rng.shuffle(bag)
+                # 新一轮的第一个不要和上一个词相同
+                if len(bag) > 1 and bag[-1] == self._last:
+                    bag[0], bag[-1] = bag[-1], bag[0]
+
+            i = bag.pop()
+        self._last = i
+        return self.pool[i]
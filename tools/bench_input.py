@@ -0,0 +1,227 @@
+"""
+按键判定基准测试：python tools/bench_input.py [--out bench_input.json] [--compare 旧结果.json]
+
+对 data/words_*.json 里的每个词生成模拟按键流，回放给 SushiPlate.check_input
+（每个按键后再调一次 get_display_text，和游戏每帧的用法一样）：
+- canonical：ROMA_MAP 优先拼法
+- alternate：其它合法拼法（shi/si、tsu/tu、xtu、nn 等）
+- typo：在优先拼法中间插入一串错误按键
+统计 ns/按键、每按键的内存峰值增量与残留 block 数、最坏路径数，
+以及每个词 compile_word 的冷编译时间（路径展开 / ROMA_MAP 展开 / 子集构造都在这里），
+按难度和假名长度分组，结果存成 JSON 方便对比。
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from src.config import DATA_DIR
+from src.models import SushiPlate, compile_word, clear_compile_cache
+
+ALTERNATE_HINTS = ("si", "tu", "xtu", "ltu", "nn", "xn", "ti", "hu", "zi")
+TYPO_KEYS = "abcdefghijklmnopqrstuvwxyz-"
+
+
+def make_streams(word, rng, alternates, typo_len):
+    """生成一个词的按键流：[(种类, 按键字符串), ...]"""
+    automaton = compile_word(word["kana"])
+    spellings = list(automaton.spellings(64))
+    if not spellings:
+        return []
+
+    canonical = spellings[0]
+    streams = [("canonical", canonical)]
+
+    others = [s for s in spellings[1:] if any(h in s for h in ALTERNATE_HINTS)]
+    others += [s for s in spellings[1:] if s not in others]
+    for s in others[:alternates]:
+        streams.append(("alternate", s))
+
+    # 错误按键：在随机位置插入一串（大多数不会被接受）
+    pos = rng.randrange(len(canonical))
+    burst = "".join(rng.choice(TYPO_KEYS) for _ in range(typo_len))
+    streams.append(("typo", canonical[:pos] + burst + canonical[pos:]))
+
+    return streams
+
+
+def replay(word, keys):
+    """回放一次按键流，返回最坏路径数"""
+    plate = SushiPlate(word)
+    width = plate.automaton.width
+    worst = width[plate.state]
+    for ch in keys:
+        plate.check_input(ch)
+        plate.get_display_text()
+        if width[plate.state] > worst:
+            worst = width[plate.state]
+    return worst
+
+
+def time_replay(word, keys, repeat):
+    """只计时按键部分（盘子构造不算）"""
+    best = None
+    for _ in range(repeat):
+        plate = SushiPlate(word)
+        check, display = plate.check_input, plate.get_display_text
+        t0 = time.perf_counter_ns()
+        for ch in keys:
+            check(ch)
+            display()
+        dt = time.perf_counter_ns() - t0
+        best = dt if best is None else min(best, dt)
+    return best
+
+
+def time_compile(word, repeat):
+    """每次先清空 compile_word 的缓存，计时一次完整编译，取最小值"""
+    best = None
+    for _ in range(repeat):
+        clear_compile_cache()
+        t0 = time.perf_counter_ns()
+        compile_word(word["kana"])
+        dt = time.perf_counter_ns() - t0
+        best = dt if best is None else min(best, dt)
+    return best
+
+
+def alloc_replay(word, keys):
+    """
+    tracemalloc 统计（不是分配次数，Python 没有现成的分配计数）：
+    - peak_bytes：每个按键期间内存峰值比按键前高出多少（字节），所有按键求和
+    - retained_blocks：整段按键之后多留下的内存 block 数
+    """
+    plate = SushiPlate(word)
+    tracemalloc.start()
+    peak_bytes = 0
+    blocks0 = sys.getallocatedblocks()
+    for ch in keys:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        plate.check_input(ch)
+        plate.get_display_text()
+        _, peak = tracemalloc.get_traced_memory()
+        peak_bytes += max(0, peak - before)
+    blocks1 = sys.getallocatedblocks()
+    tracemalloc.stop()
+    return peak_bytes, blocks1 - blocks0
+
+
+def length_bucket(n):
+    if n <= 4:
+        return "1-4"
+    if n <= 6:
+        return "5-6"
+    if n <= 8:
+        return "7-8"
+    return "9+"
+
+
+def new_group():
+    return {"words": 0, "streams": 0, "keys": 0, "ns": 0, "compile_ns": 0,
+            "peak_bytes": 0, "retained_blocks": 0, "worst_paths": 0}
+
+
+def finish_group(g):
+    keys = max(1, g["keys"])
+    return {
+        "words": g["words"],
+        "streams": g["streams"],
+        "keys": g["keys"],
+        "ns_per_key": round(g["ns"] / keys, 1),
+        # 按拼法种类分的组不按词统计，没有编译时间
+        "compile_us_per_word": round(g["compile_ns"] / g["words"] / 1000, 2) if g["words"] else None,
+        "peak_bytes_per_key": round(g["peak_bytes"] / keys, 2),
+        "retained_blocks_per_key": round(g["retained_blocks"] / keys, 3),
+        "worst_paths": g["worst_paths"],
+    }
+
+
+def run(paths, repeat, alternates, typo_len, seed):
+    rng = random.Random(seed)
+    groups = {}
+
+    for path in paths:
+        difficulty = os.path.basename(path)[len("words_"):-len(".json")].upper()
+        with open(path, "r", encoding="utf-8") as f:
+            words = json.load(f)
+
+        for word in words:
+            compile_ns = time_compile(word, repeat)
+            n_kana = len(compile_word(word["kana"]).kana_list)
+            streams = make_streams(word, rng, alternates, typo_len)
+            for kind, keys in streams:
+                worst = replay(word, keys)
+                ns = time_replay(word, keys, repeat)
+                peak_bytes, blocks = alloc_replay(word, keys)
+
+                for key in ("ALL", difficulty, f"{difficulty}/len {length_bucket(n_kana)}", f"{difficulty}/{kind}"):
+                    g = groups.setdefault(key, new_group())
+                    g["streams"] += 1
+                    g["keys"] += len(keys)
+                    g["ns"] += ns
+                    g["peak_bytes"] += peak_bytes
+                    g["retained_blocks"] += blocks
+                    g["worst_paths"] = max(g["worst_paths"], worst)
+
+            for key in ("ALL", difficulty, f"{difficulty}/len {length_bucket(n_kana)}"):
+                g = groups.setdefault(key, new_group())
+                g["words"] += 1
+                g["compile_ns"] += compile_ns
+
+    return {key: finish_group(g) for key, g in sorted(groups.items())}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="按键判定基准测试")
+    parser.add_argument("files", nargs="*",
+                        help="词库 json 文件（默认 data/words_*.json）")
+    parser.add_argument("--out", default="bench_input.json", help="结果输出路径")
+    parser.add_argument("--compare", default=None, help="与之前保存的结果对比")
+    parser.add_argument("--repeat", type=int, default=5, help="每个按键流 / 每次编译计时几次取最小值")
+    parser.add_argument("--alternates", type=int, default=3, help="每个词最多几种其它拼法")
+    parser.add_argument("--typo-len", type=int, default=4, help="错误按键串长度")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    paths = args.files or sorted(glob.glob(os.path.join(DATA_DIR, "words_*.json")))
+    results = run(paths, max(1, args.repeat), args.alternates, args.typo_len, args.seed)
+
+    old = {}
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            old = json.load(f).get("groups", {})
+
+    print(f"{'group':<24}{'keys':>8}{'ns/key':>10}{'peakB/key':>10}{'paths':>7}{'us/compile':>12}")
+    for key, r in results.items():
+        line = (f"{key:<24}{r['keys']:>8}{r['ns_per_key']:>10}{r['peak_bytes_per_key']:>10}"
+                f"{r['worst_paths']:>7}{r['compile_us_per_word'] or '-':>12}")
+        deltas = []
+        for field, name in (("ns_per_key", "key"), ("compile_us_per_word", "compile")):
+            if key in old and old[key].get(field) and r[field]:
+                deltas.append(f"{name} {(r[field] / old[key][field] - 1) * 100:+.1f}%")
+        if deltas:
+            line += f"  ({', '.join(deltas)})"
+        print(line)
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": sys.version.split()[0],
+            "args": vars(args),
+            "groups": results,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"结果已保存: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
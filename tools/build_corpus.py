@@ -0,0 +1,198 @@
+"""
+从自治体总表生成词库：python tools/build_corpus.py master.csv [--out-dir data]
+
+总表为 CSV / TSV，每行：都道府県, 名称, 读音（有表头也可以）
+- 读音统一转成平假名（片假名 -> ひらがな）
+- roma 用游戏同一套 ROMA_MAP / 自动机生成（保证游戏里能打出来）
+- 去重（都道府県 + 名称 + 读音）
+- 按最短按键数分成 EASY / MEDIUM / HARD，写出 words_easy/medium/hard.json
+多进程计算；结果缓存在 --cache 文件里，下次只重新计算新增 / 改动的行
+（ROMA_MAP 有变化时缓存自动作废）。
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from src.config import DATA_DIR
+from src.corpus import roma_map_hash
+from src.models import ROMA_MAP, compile_word
+
+HEADER_WORDS = {"prefecture", "pref", "都道府県", "都道府県名"}
+
+
+def to_hiragana(text):
+    """片假名 -> 平假名（ァ..ヶ 平移 0x60），去掉空白"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if 0x30A1 <= code <= 0x30F6:
+            ch = chr(code - 0x60)
+        if not ch.isspace():
+            out.append(ch)
+    return "".join(out)
+
+
+def hepburn(automaton, double_sokuon):
+    """按 ROMA_MAP 优先拼法拼出 romaji；っ 写成下一个辅音（double_sokuon 时双写）"""
+    table = automaton.table
+    parts = []
+    for i, kana in enumerate(automaton.kana_list):
+        if kana == 'っ' and i + 1 < len(table) and table[i + 1]:
+            first = table[i + 1][0][0]
+            if first not in "aeiou":
+                if double_sokuon:
+                    parts.append("t" if table[i + 1][0].startswith("ch") else first)
+                continue
+        if kana == 'ん':
+            parts.append("n")
+            continue
+        parts.append(table[i][0] if table[i] else "?")
+    return "".join(parts)
+
+
+def accepts(automaton, text):
+    state = 0
+    for ch in text:
+        state = automaton.trans[state].get(ch)
+        if state is None:
+            return False
+        if automaton.cleared[state]:
+            return True
+    return False
+
+
+def build_entry(row):
+    """计算一行（在子进程里运行）：返回 (key, 结果 dict 或错误信息)"""
+    key, pref, name, reading = row
+    kana = to_hiragana(reading)
+    missing = sorted({ch for ch in kana if ch not in "".join(ROMA_MAP)})
+    if not kana or missing:
+        return key, {"error": f"无法输入的读音 '{reading}' {' '.join(missing)}".strip()}
+
+    automaton = compile_word(kana)
+    if automaton.min_len is None:
+        return key, {"error": f"无法输入的读音 '{reading}'"}
+
+    # 优先 beppu 式双写，其次单写，最后用自动机的第一个合法拼法
+    roma = None
+    for candidate in (hepburn(automaton, True), hepburn(automaton, False)):
+        if accepts(automaton, candidate):
+            roma = candidate
+            break
+    if roma is None:
+        roma = next(automaton.spellings(1))
+
+    return key, {"kana": kana, "roma": roma, "min_len": automaton.min_len}
+
+
+def read_master(path, delimiter=None):
+    """读总表，返回去重后的 [(key, 都道府県, 名称, 读音), ...]"""
+    if delimiter is None:
+        delimiter = "\t" if path.lower().endswith((".tsv", ".tab")) else ","
+
+    rows = []
+    seen = set()
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        for n, cols in enumerate(csv.reader(f, delimiter=delimiter)):
+            cols = [c.strip() for c in cols]
+            if len(cols) < 3 or not all(cols[:3]):
+                continue
+            if n == 0 and cols[0].lower() in HEADER_WORDS:
+                continue
+            pref, name, reading = cols[:3]
+            key = f"{pref}\t{name}\t{to_hiragana(reading)}"
+            if key in seen:
+                continue
+            seen.add(key)
+            rows.append((key, pref, name, reading))
+    return rows
+
+
+def load_cache(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("roma_map") != roma_map_hash():
+        return {}
+    return cache.get("rows", {})
+
+
+def save_cache(path, rows):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"roma_map": roma_map_hash(), "rows": rows}, f, ensure_ascii=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="从自治体总表生成 words_*.json")
+    parser.add_argument("master", help="CSV / TSV 总表（都道府県, 名称, 读音）")
+    parser.add_argument("--out-dir", default=DATA_DIR, help="输出目录（默认 data/）")
+    parser.add_argument("--cache", default=None, help="增量缓存文件（默认 <out-dir>/.corpus_cache.json）")
+    parser.add_argument("--delimiter", default=None, help="分隔符（默认按扩展名判断）")
+    parser.add_argument("--easy-max", type=int, default=8, help="EASY 最短按键数上限")
+    parser.add_argument("--medium-max", type=int, default=11, help="MEDIUM 最短按键数上限")
+    parser.add_argument("--workers", type=int, default=None, help="进程数（默认 CPU 核数）")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    rows = read_master(args.master, args.delimiter)
+    cache_path = args.cache or os.path.join(args.out_dir, ".corpus_cache.json")
+    cache = load_cache(cache_path)
+
+    todo = [row for row in rows if row[0] not in cache]
+    if todo:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for key, result in pool.map(build_entry, todo, chunksize=64):
+                cache[key] = result
+
+    # 只保留总表里还在的行
+    cache = {row[0]: cache[row[0]] for row in rows}
+    os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+    save_cache(cache_path, cache)
+
+    courses = {"easy": [], "medium": [], "hard": []}
+    errors = 0
+    for key, pref, name, reading in rows:
+        result = cache[key]
+        if "error" in result:
+            errors += 1
+            print(f"[NG] {pref} {name}: {result['error']}")
+            continue
+
+        if result["min_len"] <= args.easy_max:
+            course = "easy"
+        elif result["min_len"] <= args.medium_max:
+            course = "medium"
+        else:
+            course = "hard"
+        courses[course].append({
+            "prefix_kanji": pref,
+            "kanji": name,
+            "kana": result["kana"],
+            "roma": result["roma"],
+            "min_len": result["min_len"],
+        })
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    for course, words in courses.items():
+        path = os.path.join(args.out_dir, f"words_{course}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(words, f, ensure_ascii=False, indent=2)
+        print(f"{path}: {len(words)} 词")
+
+    print(f"完成: {len(rows)} 行（重新计算 {len(todo)} 行, 错误 {errors} 行）, 用时 {time.perf_counter() - t0:.2f}s")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
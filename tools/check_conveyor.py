@@ -0,0 +1,93 @@
+"""
+多盘子模式自检：python tools/check_conveyor.py
+
+- 按键分发（PlateRouter）：回放几段按键，检查每个按键的判定结果
+- 传送带布局（Conveyor）：跑一段时间，检查两条轨道的盘子上下不重叠、出盘互相错开，
+  HUD 跟着的盘子（focus）一直在屏幕上
+有问题时退出码为 1。
+"""
+import os
+import sys
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import pygame
+
+from src.config import MULTI_LANES_Y, MULTI_PLATE_SIZE, MULTI_PLATE_GAP, MULTI_PLATE_SPEED
+from src.conveyor import Conveyor, PlateRouter
+from src.models import SushiPlate
+
+# (盘子的假名, 按键, 每个按键期望的结果)
+ROUTER_CASES = [
+    # 先打了 k（只有 かわ 接得住），改打 sato：s 算打错，但 さと 已经从 s 开始
+    (["かわ", "さと"], "ksato", ["HIT", "MISS", "HIT", "HIT", "CLEARED"]),
+    # 哪个盘子都不能从这个键开始：普通打错，前缀保留
+    (["かわ", "さと"], "kaqwa", ["HIT", "HIT", "MISS", "HIT", "CLEARED"]),
+    # 两个盘子共用前缀，分岔后只剩一个候选
+    (["かわ", "かさ"], "kasa", ["HIT", "HIT", "HIT", "CLEARED"]),
+]
+
+
+def make_plate(kana):
+    return SushiPlate({"kanji": kana, "kana": kana, "roma": ""})
+
+
+def check_router():
+    problems = []
+    for kanas, keys, expected in ROUTER_CASES:
+        router = PlateRouter()
+        for kana in kanas:
+            router.add(make_plate(kana))
+        results = [router.feed(ch)[0] for ch in keys]
+        if results != expected:
+            problems.append(f"router {kanas} '{keys}': {results}（期望 {expected}）")
+    return problems
+
+
+def check_layout(steps=3000):
+    problems = []
+    w, h = MULTI_PLATE_SIZE
+    lanes = sorted(MULTI_LANES_Y)
+    for a, b in zip(lanes, lanes[1:]):
+        if b - a < h:
+            problems.append(f"轨道 y={a} / y={b} 间距小于盘子高度 {h}")
+
+    conveyor = Conveyor(lambda: make_plate("かわ"))
+    conveyor.spawn()
+    min_dx = None
+    hidden_focus = 0
+    for _ in range(steps):
+        conveyor.update()
+        focus = conveyor.focus()
+        if focus is not None and focus.x + w <= 0:
+            hidden_focus += 1
+        plates = list(conveyor.sprites)
+        for p in plates:
+            for q in plates:
+                if p.y < q.y and -w < p.x < 900 and -w < q.x < 900:
+                    dx = abs(p.x - q.x)
+                    min_dx = dx if min_dx is None else min(min_dx, dx)
+
+    want = MULTI_PLATE_GAP // 2 - MULTI_PLATE_SPEED
+    if min_dx is not None and min_dx < want:
+        problems.append(f"相邻轨道的盘子没有错开：最小水平距离 {min_dx:.0f}px（期望 >= {want:.0f}）")
+    if hidden_focus:
+        problems.append(f"focus 指向已经出了屏幕的盘子：{hidden_focus} 帧")
+    return problems
+
+
+def main():
+    pygame.init()
+    problems = check_router() + check_layout()
+    for msg in problems:
+        print(f"[NG] {msg}")
+    print(f"检查完成: 问题 {len(problems)} 个")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
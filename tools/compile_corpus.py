@@ -0,0 +1,39 @@
+"""
+把 data/words_*.json 编译成二进制词库 words_*.bin：python tools/compile_corpus.py [json 文件 ...]
+
+游戏开局时如果找到比 json 新的 .bin，会直接 mmap 打开，不再解析 json。
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from src.config import DATA_DIR
+from src.corpus import write_binary_corpus
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="编译二进制词库")
+    parser.add_argument("files", nargs="*",
+                        help="json 词库（默认 data/words_*.json）")
+    args = parser.parse_args(argv)
+
+    paths = args.files or sorted(glob.glob(os.path.join(DATA_DIR, "words_*.json")))
+    for path in paths:
+        t0 = time.perf_counter()
+        with open(path, "r", encoding="utf-8") as f:
+            words = json.load(f)
+        out = os.path.splitext(path)[0] + ".bin"
+        write_binary_corpus(words, out)
+        print(f"{out}: {len(words)} 词, {os.path.getsize(out)} bytes, {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
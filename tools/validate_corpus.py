@@ -0,0 +1,109 @@
+"""
+词库离线校验：python tools/validate_corpus.py [json 文件 ...]
+
+对 data/words_*.json 里的每个词：
+- 用游戏同一套输入判定（split_kana / SushiPlate）枚举所有可接受的 romaji（最多 --cap 个）
+- 检查 roma 字段能不能被接受（输入到最后一个字母刚好 CLEARED）
+- 找出 ROMA_MAP 里没有的假名（游戏里会显示成 "?"，永远打不完）
+有问题时退出码为 1，方便在发布前跑一遍。
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from src.config import DATA_DIR
+from src.models import ROMA_MAP, SushiPlate, compile_word
+
+
+def check_entry(job):
+    """校验单个词（在子进程里运行）"""
+    source, index, word, cap = job
+    kana = word.get("kana", "")
+    roma = word.get("roma", "").lower()
+    problems = []
+
+    automaton = compile_word(kana)
+    missing = sorted({k for k in automaton.kana_list if k not in ROMA_MAP})
+    if missing:
+        problems.append(f"ROMA_MAP 缺少假名: {' '.join(missing)}")
+
+    spellings = list(automaton.spellings(cap))
+    if not spellings:
+        problems.append("没有任何可接受的输入")
+
+    if not roma:
+        problems.append("roma 字段为空")
+    else:
+        plate = SushiPlate(word)
+        results = [plate.check_input(ch) for ch in roma]
+        if results[-1] != "CLEARED" or "MISS" in results:
+            problems.append(f"roma '{roma}' 不被接受（例如: {spellings[0] if spellings else '-'}）")
+
+    return {
+        "source": source,
+        "index": index,
+        "kanji": word.get("kanji", ""),
+        "kana": kana,
+        "roma": roma,
+        "spellings": spellings,
+        "capped": len(spellings) >= cap,
+        "problems": problems,
+    }
+
+
+def load_jobs(paths, cap):
+    jobs = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            words = json.load(f)
+        source = os.path.basename(path)
+        for i, word in enumerate(words):
+            jobs.append((source, i, word, cap))
+    return jobs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="校验 words_*.json 词库")
+    parser.add_argument("files", nargs="*",
+                        help="要校验的 json 文件（默认 data/words_*.json）")
+    parser.add_argument("--cap", type=int, default=200,
+                        help="每个词最多枚举多少种拼法（默认 200）")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="进程数（默认 CPU 核数）")
+    parser.add_argument("--show-spellings", action="store_true",
+                        help="输出每个词的全部可接受拼法")
+    args = parser.parse_args(argv)
+
+    paths = args.files or sorted(glob.glob(os.path.join(DATA_DIR, "words_*.json")))
+    t0 = time.perf_counter()
+    jobs = load_jobs(paths, max(1, args.cap))
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(check_entry, jobs, chunksize=64))
+
+    bad = 0
+    for r in results:
+        if args.show_spellings:
+            more = " ..." if r["capped"] else ""
+            print(f"{r['source']}#{r['index']} {r['kanji']}({r['kana']}): {', '.join(r['spellings'])}{more}")
+        if r["problems"]:
+            bad += 1
+            for msg in r["problems"]:
+                print(f"[NG] {r['source']}#{r['index']} {r['kanji']}({r['kana']}): {msg}")
+
+    elapsed = time.perf_counter() - t0
+    print(f"校验完成: {len(results)} 词, 问题 {bad} 个, 用时 {elapsed:.2f}s")
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())